@@ -7,147 +7,236 @@
 
 import sys
 import os
+import logging
 
-from PySide6.QtWidgets import ( 
-    QApplication, 
-    QMainWindow, QTextEdit, QToolBar, QDockWidget, QListWidget, QFileDialog,
-    QLabel, QTextEdit, QFileDialog, QAbstractButton, QWidget, QStackedWidget, QTabWidget,    
-    QLineEdit, QSplitter, 
-    QPushButton, QButtonGroup,
-    QVBoxLayout, QHBoxLayout, QMdiArea, QMdiSubWindow, QSizePolicy, QCheckBox,
-    QFormLayout, QGridLayout, QGroupBox, QComboBox,
-    QMessageBox
-)
-from PySide6.QtGui import QPixmap, QFont, QIcon, QPainter
-from PySide6.QtCore import Qt, QSize, QTimer, Signal, QSettings, QEvent, QPropertyAnimation
+from PySide6.QtWidgets import QHBoxLayout, QMainWindow, QWidget
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import QPropertyAnimation, QSettings, QSize, QTimer, Qt
 
 if __name__ == "__main__": 
     print("Debug mode!")   
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if project_root not in sys.path: sys.path.insert(0, project_root)
 
-from Utils.Utils import utils
+from Utils.Utils import CachedSettings, utils
 from GUI.Item_Toolbar import Tool_Bar
 from GUI.Item_SettingPage import Setting_Window
 from GUI.Item_Centralwidget import Chat_Central_Widget
 from GUI.Item_SidePanel import Slide_Side_Panel
 from GUI.Language_Manager import Language_Manager
 
-from Operation.Operation_Mainwindow import Operation_Mainwindow_Controller
-from Operation.Operation_Setting import Operation_Setting_Controller
-from Operation.Operation_Chat_Controller import Operation_Chat_Controller
+logger = logging.getLogger(__name__)
+
+# Default values written to settings.ini when a key is missing
+SETTINGS_DEFAULTS = (
+    ("Font/type",                  "Microsoft YaHei"),
+    ("Font/size",                  10),
+    ("Appearance/theme",           "Light"),
+    ("Appearance/toolbar_icons",   True),
+    ("Appearance/chat_background", ""),
+    ("Appearance/reduce_animations", False),
+    ("Language/type",              "English"),
+    ("Search/Baidu",               True),
+    ("Search/Google",              False),
+    ("AI/system_prompt",           "You are a helpful assistant."),
+    ("AI/temperature",             0.7),
+)
 
 class AI_Chat_App(QMainWindow):
 
+    _STYLESHEET = """
+        QMainWindow::separator {
+        width: 4px;
+        height: 5px;
+        background: #F0F0F0;
+        }
+        QLineEdit {
+            padding: 2px 5px 2px 5px;
+            padding-left: 5px;
+            border: 1px solid #ccc;
+            border-radius: 3px;
+            background-color: #fff;
+            font-size: 14px;
+            height: 20px;
+        }
+        QLineEdit:focus {
+            border: 1px solid #0078d4;
+        }
+        QToolButton {
+            icon-size: 24px;
+            margin-right: 10px;
+            margin: 0px 10px;
+        }
+        QScrollBar:vertical {
+            background: transparent;
+            width: 10px;
+            margin: 4px 2px 4px 2px;
+            border-radius: 8px;
+        }
+        QScrollBar::handle:vertical {
+            background: rgba(0,0,0,0.25);
+            min-height: 30px;
+            border-radius: 8px;
+        }
+        QScrollBar::handle:vertical:hover {
+            background: rgba(0,0,0,0.45);
+        }
+        QScrollBar::add-line:vertical,
+        QScrollBar::sub-line:vertical {
+            height: 0px;
+        }
+        QScrollBar::add-page:vertical,
+        QScrollBar::sub-page:vertical {
+            background: none;
+        }
+    """
+
+    _WINDOW_ICON = None
+
+    @classmethod
+    def _get_icon(cls):
+        # Loaded on first use (a QApplication must exist) and shared by all windows
+        if cls._WINDOW_ICON is None:
+            cls._WINDOW_ICON = QIcon(utils.resource_path("images/AIchat_Combo_Logo.jpeg"))
+        return cls._WINDOW_ICON
+
     def __init__(self):
 
         super().__init__()
 
+        # The chat backend is created once the event loop is running so the
+        # main window can be painted first (see _init_chat_controller)
+        self.operation_chat = None
+        self._resize_pending = False
+
         self.language_manager = Language_Manager()
         self.settings = None
 
         self.init_styles()
         self.init_main_ui()
 
-        self.setting_page = Setting_Window(self)
+        self._panel_anim = None
+        self._pending_model = None
+
+        # Coalesce bubble re-layouts while the side panel is being dragged (~60 Hz)
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self._apply_resize)
+
+        # Operation controllers are imported here so importing this module stays cheap
+        from Operation.Operation_Mainwindow import Operation_Mainwindow_Controller
+        from Operation.Operation_Setting import Operation_Setting_Controller
+
+        self._setting_page = None
         self.operation_mainwindow = Operation_Mainwindow_Controller(self)
         self.operation_setting = Operation_Setting_Controller(self)
 
         self.load_settings_on_startup()
 
-        self.operation_chat    = Operation_Chat_Controller(self)
-
         self.connect_signals()
 
+        QTimer.singleShot(0, self._init_chat_controller)
+
+    def _init_chat_controller(self):
+
+        from Operation.Operation_Chat_Controller import Operation_Chat_Controller
+
+        self.operation_chat = Operation_Chat_Controller(self)
+        self.connect_signals_chat()
+
+    @property
+    def setting_page(self):
+        # The preferences dialog is only built the first time it is needed
+        if self._setting_page is None:
+            self._setting_page = Setting_Window(self)
+            # The dialog writes through its own QSettings, drop stale cached reads first
+            self._setting_page.apply_settings_signal.connect(self.settings.clear_cache)
+            self._setting_page.apply_settings_signal.connect(self.operation_setting.apply_new_settings)
+            self._setting_page.update_ui_texts(self.language_manager)
+        return self._setting_page
+
     def load_settings_on_startup(self):
 
-        usr_folder = utils.get_usr_dir()
-        settings_path = usr_folder / "settings.ini"
+        settings_path = utils.get_settings_path()
         
-        settings = QSettings(str(settings_path), QSettings.Format.IniFormat)
-
-        def check_and_set_default(key, default_value):
-            if not settings.contains(key):
-                settings.setValue(key, default_value)
+        settings = CachedSettings(str(settings_path), QSettings.Format.IniFormat)
 
         is_first_run = not settings_path.exists()
         
         if is_first_run:
-            print("[INFO] No settings.ini found. Creating default settings...")
+            logger.info("No settings.ini found. Creating default settings...")
 
-        check_and_set_default("Font/type", "Microsoft YaHei") 
-        check_and_set_default("Font/size", 10)
-        
-        check_and_set_default("Appearance/theme", "Light")
-        check_and_set_default("Appearance/toolbar_icons", True)
-        
-        check_and_set_default("Appearance/chat_background", "") 
-
-        check_and_set_default("Language/type", "English")
-
-        check_and_set_default("Search/Baidu", True)
-        check_and_set_default("Search/Google", False)
+        # Read the key list once and only write the defaults that are missing
+        existing_keys = set(settings.allKeys())
+        for key, default_value in SETTINGS_DEFAULTS:
+            if key not in existing_keys:
+                settings.setValue(key, default_value)
 
         old_key = settings.value("Advanced/api_key", "")
-        if old_key and not settings.contains("AI/api_key"):
-            print("[INFO] Migrating old API Key to new AI settings structure...")
+        if old_key and "AI/api_key" not in existing_keys:
+            logger.info("Migrating old API Key to new AI settings structure...")
             settings.setValue("AI/api_key", old_key)
             settings.remove("Advanced")
         
-        usr_dir = utils.get_usr_dir()
-        account_file = usr_dir / "account.json"
+        account_file = utils.get_usr_dir() / "account.json"
+        try:
+            account_mtime = str(account_file.stat().st_mtime_ns)
+        except OSError:
+            account_mtime = ""
+
+        # account.json has not been touched since the last start, the AI
+        # values already in settings.ini are current
+        if account_mtime and "AI/provider" in existing_keys and \
+                settings.value("AI/_account_json_mtime", "", type=str) == account_mtime:
+            logger.info("account.json unchanged. Using AI config from settings.ini")
+        else:
+            self._load_account_config(settings, account_file, account_mtime)
+
+        settings.sync()
+        self.settings = settings
+        
+        if is_first_run:
+            logger.info("Default settings created successfully.")
+        else:
+            logger.info("Settings loaded from: %s", settings_path)
+
+        if hasattr(self, "operation_setting"):
+            self.operation_setting.apply_new_settings(self.settings)
+
+    def _load_account_config(self, settings, account_file, account_mtime):
+        """Copy the AI config from account.json into settings.ini."""
         default_provider, default_base_url, default_key, default_models = self.tool_bar.load_AI_config(account_file)
         if default_provider and default_base_url and default_key and default_models:
-            print("[INFO] Provider (GUI):", default_provider)
-            print("[INFO] Base URL (GUI):", default_base_url)
-            print("[INFO] API Key (GUI):", default_key)
-            print("[INFO] Models (GUI):", default_models)
+            logger.info("Provider (GUI): %s", default_provider)
+            logger.info("Base URL (GUI): %s", default_base_url)
+            logger.debug("API Key (GUI): %s...", default_key[:6])
+            logger.info("Models (GUI): %s", default_models)
         else:
-            print("[ERROR] (GUI) Failed to load OpenRouter configuration.")
-
-        default_provider_lower = default_provider.lower()
-        found_index = -1
+            logger.error("(GUI) Failed to load OpenRouter configuration.")
 
-        for i in range(self.setting_page.provider_combo.count()):
-            item_lower = self.setting_page.provider_combo.itemText(i).lower()
-            if default_provider_lower in item_lower:
-                found_index = i
-                break
+        # Match against the provider names directly; the combo box reads
+        # AI/provider from settings.ini when the dialog is eventually built
+        found_index = Setting_Window.find_provider_index(default_provider)
 
         if found_index != -1:
-            self.setting_page.provider_combo.setCurrentIndex(found_index)
-            selected_provider = self.setting_page.provider_combo.itemText(found_index)
-            print(f"[INFO] Set provider combo box to index {found_index} ({selected_provider})")
+            selected_provider = Setting_Window.PROVIDERS[found_index]
+            logger.info("Set provider to index %d (%s)", found_index, selected_provider)
         else:
-            custom_index = self.setting_page.provider_combo.findText("Custom")
-            self.setting_page.provider_combo.setCurrentIndex(custom_index)
             selected_provider = "Custom"
-            print("[INFO] Provider not found in combo box. Setting to 'Custom'")
+            logger.info("Provider not found in provider list. Setting to 'Custom'")
 
         if default_provider and default_base_url and default_key:
-            print("[INFO] Overwriting settings.ini AI config with account.json values...")
+            logger.info("Overwriting settings.ini AI config with account.json values...")
 
             settings.setValue("AI/provider", selected_provider)
             settings.setValue("AI/base_url", default_base_url)
             settings.setValue("AI/api_key", default_key)
             settings.setValue("AI/model", default_models[0] if default_models else "openai/gpt-oss-120b")
+            settings.setValue("AI/_account_json_mtime", account_mtime)
 
         else:
-            print("[WARN] account.json has no valid values. Using settings.ini or defaults.")
-
-        check_and_set_default("AI/system_prompt", "You are a helpful assistant.")
-        check_and_set_default("AI/temperature", 0.7)
-
-        settings.sync()
-        self.settings = settings
-        
-        if is_first_run:
-            print("[INFO] Default settings created successfully.")
-        else:
-            print(f"[INFO] Settings loaded from: {settings_path}")
-
-        if hasattr(self, "operation_setting"):
-            self.operation_setting.apply_new_settings()
+            logger.warning("account.json has no valid values. Using settings.ini or defaults.")
 
     def connect_signals(self):
 
@@ -155,22 +244,14 @@ class AI_Chat_App(QMainWindow):
         self.tool_bar.show_setting_page_requested.connect(self.operation_mainwindow.handle_show_setting)
         self.side_panel.show_settings_requested.connect(self.operation_mainwindow.handle_show_setting)
 
-        self.tool_bar.model_changed_signal.connect(self.operation_chat.worker.update_config)
-        self.tool_bar.model_changed_signal.connect(self.operation_chat.update_model_for_chat_controller)
-
-        self.side_panel.new_chat_requested.connect(self.operation_chat.handle_new_chat)
-        self.side_panel.chat_item_double_clicked.connect(self.operation_chat.handle_open_chat_file)
-
         self.chat_window.show_setting_page_requested_from_chatwindow.connect(self.operation_mainwindow.handle_show_setting)
         self.chat_window.new_chat_requested_from_chatwindow.connect(self.side_panel.on_new_chat)
         self.chat_window.new_folder_requested_from_chatwindow.connect(self.side_panel.on_new_folder)
 
-        usr_folder = utils.get_usr_dir()    
-        settings_file_path = usr_folder / "settings.ini"
+        assert self.settings is not None, "load_settings_on_startup() must run before connect_signals()"
 
-        settings   = QSettings(str(settings_file_path), QSettings.Format.IniFormat)
-        use_baidu  = settings.value("Search/Baidu", True, type=bool)
-        use_google = settings.value("Search/Google", False, type=bool)
+        use_baidu  = self.settings.value("Search/Baidu", True, type=bool)
+        use_google = self.settings.value("Search/Google", False, type=bool)
 
         try:
             self.tool_bar.search_requested.disconnect()
@@ -184,15 +265,39 @@ class AI_Chat_App(QMainWindow):
         else:
             self.tool_bar.search_requested.connect(self.operation_mainwindow.perform_baidu_search)
 
-        self.setting_page.apply_settings_signal.connect(self.operation_setting.apply_new_settings)
+
+    def connect_signals_chat(self):
+
+        if self.operation_chat is None:
+            return
+
+        self.tool_bar.model_changed_signal.connect(self._on_model_changed, Qt.QueuedConnection)
+
+        self.side_panel.new_chat_requested.connect(self.operation_chat.handle_new_chat)
+        self.side_panel.chat_item_double_clicked.connect(self.operation_chat.handle_open_chat_file)
 
         self.chat_window.send_message_signal.connect(self.operation_chat.send_message)
 
+    def _on_model_changed(self, new_model, new_model_icon):
+        # Only the latest model of a burst of combo box changes is applied
+        flush_scheduled = self._pending_model is not None
+        self._pending_model = (new_model, new_model_icon)
+        if not flush_scheduled:
+            QTimer.singleShot(0, self._flush_model_change)
+
+    def _flush_model_change(self):
+        if self._pending_model is None:
+            return
+        new_model, new_model_icon = self._pending_model
+        self._pending_model = None
+        if self.operation_chat is not None:
+            self.operation_chat.update_model_for_chat_controller(new_model, new_model_icon)
+
     def init_main_ui(self):
 
         self.setWindowTitle("AiChatCombo")
         self.resize(1300, 800)
-        self.setWindowIcon(QIcon(utils.resource_path("images/AIchat_Combo_Logo.jpeg")))
+        self.setWindowIcon(type(self)._get_icon())
 
         self.tool_bar = Tool_Bar(self)
         self.tool_bar.setMovable(False)
@@ -216,6 +321,8 @@ class AI_Chat_App(QMainWindow):
 
         main_widget = QWidget()
         main_widget.setContentsMargins(0, 0, 0, 0)
+        # Hold repaints until the whole layout is in place
+        main_widget.setUpdatesEnabled(False)
 
         main_layout = QHBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -230,6 +337,7 @@ class AI_Chat_App(QMainWindow):
         main_widget.setLayout(main_layout)
 
         self.setCentralWidget(main_widget)
+        main_widget.setUpdatesEnabled(True)
 
     def toggle_side_panel(self):
         panel = self.side_panel
@@ -241,11 +349,16 @@ class AI_Chat_App(QMainWindow):
         else:
             target_width = panel.full_width if hasattr(panel, "full_width") and panel.full_width > 150 else 280
 
-        anim = QPropertyAnimation(panel, b"maximumWidth")
-        anim.setDuration(250)
-        anim.setStartValue(panel.width())
-        anim.setEndValue(target_width)
-        anim.start()
+        if self.settings.value("Appearance/reduce_animations", False, type=bool):
+            panel.setMaximumWidth(target_width)
+        else:
+            if self._panel_anim is None:
+                self._panel_anim = QPropertyAnimation(panel, b"maximumWidth", self)
+                self._panel_anim.setDuration(250)
+            self._panel_anim.stop()
+            self._panel_anim.setStartValue(panel.width())
+            self._panel_anim.setEndValue(target_width)
+            self._panel_anim.start()
 
         panel.setMinimumWidth(0)
         panel.is_visible = not currently_visible
@@ -254,7 +367,6 @@ class AI_Chat_App(QMainWindow):
             self.drag_handle.show()
         else:
             self.drag_handle.hide()
-        panel._anim = anim
 
     def handle_mouse_press(self, event):
         self.drag_start_x = event.globalPosition().x()
@@ -287,11 +399,15 @@ class AI_Chat_App(QMainWindow):
 
         self.chat_window.adjust_input_height()
 
-        if hasattr(self, "operation_chat"):
-            self.operation_chat._update_all_bubbles_width()
+        if not self._resize_timer.isActive():
+            self._resize_timer.start()
 
         event.accept()
 
+    def _apply_resize(self):
+        if self.operation_chat is not None:
+            self.operation_chat._update_all_bubbles_width()
+
     def handle_mouse_release(self, event):
         self.side_panel.panel_width = self.side_panel.width()
         event.accept()
@@ -300,89 +416,23 @@ class AI_Chat_App(QMainWindow):
 
         super().resizeEvent(event)
 
-        self.chat_window.adjust_input_height()
-        self.chat_window.update_input_container_position()
+        # Run the layout updates once per event loop pass while dragging
+        if not self._resize_pending:
+            self._resize_pending = True
+            QTimer.singleShot(0, self._do_resize_updates)
+
+    def _do_resize_updates(self):
+
+        try:
+            self.chat_window.adjust_input_height()
+            self.chat_window.update_input_container_position()
 
-        if hasattr(self, "operation_chat"):
-            QTimer.singleShot(0, self.operation_chat._update_all_bubbles_width)
+            if self.operation_chat is not None:
+                self.operation_chat._update_all_bubbles_width()
+        finally:
+            # Always re-arm, or every later resize would be dropped
+            self._resize_pending = False
 
     def init_styles(self):
 
-        self.setStyleSheet("""
-            QMainWindow::separator {
-            width: 4px;
-            height: 5px;
-            background: #F0F0F0;
-            }        
-            QtoolBar {
-                background-color: #F0F0F0;
-            }
-            QLineEdit {
-                padding: 2px 5px 2px 5px;
-                padding-left: 5px;
-                border: 1px solid #ccc;
-                border-radius: 3px;
-                background-color: #fff;
-                font-size: 14px;
-                height: 20px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #0078d4;
-            }
-            QtoolBar::item {
-                padding: 3px 15px 3px 15px;
-                background: transparent;
-                color: black;
-                qproperty-alignment: 'AlignCenter';
-            }
-            QtoolBar::item:selected {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #FFFFFF,
-                    stop:1 #FFF0F0
-                );
-                color: black;
-                border-radius: 3px;
-            }
-            Qtool::item {
-                padding: 5px 20px;
-                background-color: white;
-                color: black;
-            }
-            Qtool::item:selected {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #FFFFFF,
-                    stop:1 #C7ECFF
-                );
-                color: black;
-                border-radius: 4px;
-            }            
-            QToolButton {
-                icon-size: 24px;
-                margin-right: 10px;
-                margin: 0px 10px;
-            }
-            QScrollBar:vertical {
-                background: transparent;
-                width: 10px;
-                margin: 4px 2px 4px 2px;
-                border-radius: 8px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(0,0,0,0.25);
-                min-height: 30px;
-                border-radius: 8px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(0,0,0,0.45);
-            }
-            QScrollBar::add-line:vertical,
-            QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar::add-page:vertical,
-            QScrollBar::sub-page:vertical {
-                background: none;
-            }           
-        """)
+        self.setStyleSheet(self._STYLESHEET)
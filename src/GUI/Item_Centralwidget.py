@@ -10,23 +10,23 @@ import sys  # Import system-specific parameters and functions
 import os
 import webbrowser
 
+from collections import OrderedDict
+
 from pathlib import Path
 
 
 #-----------------------------------------------------------------------------------------
 # Import PyQt5 widgets for UI elements
 from PySide6.QtWidgets import ( 
-    QApplication, 
-    QMainWindow, QTextEdit, QToolBar, QDockWidget, QListWidget, QFileDialog, QGraphicsDropShadowEffect,
-    QLabel, QTextEdit, QFileDialog, QAbstractButton, QWidget, QStackedWidget, QStackedLayout,    
-    QLineEdit, QSplitter, QScrollArea, QFrame,
-    QPushButton, QRadioButton, QButtonGroup, QWidgetAction,
-    QVBoxLayout, QHBoxLayout, QSizePolicy, QTreeWidget, QTreeWidgetItem, QCheckBox,
-    QFormLayout, QGridLayout, QDialog, QDialogButtonBox, QComboBox,
-    QMenu
+    QFileDialog, QFrame, QGraphicsDropShadowEffect, QGraphicsScene, QHBoxLayout, QLabel, QPushButton,
+    QScrollArea, QSizePolicy, QStackedLayout, QTextEdit, QVBoxLayout, QWidget
 )
-from PySide6.QtGui import QPixmap, QPainter, QIcon, QAction, QMovie, QColor, QTextCursor, QTextImageFormat   # Import classes for images, fonts, and icons
-from PySide6.QtCore import Qt, QSize, QDateTime, Signal, QTimer, QRect, QEvent          # Import Qt core functionalities such as alignment
+from PySide6.QtGui import (
+    QColor, QIcon, QImage, QImageReader, QMovie, QPainter, QPixmap, QPixmapCache, QTextCursor, QTextDocument, QTextImageFormat
+)   # Import classes for images, fonts, and icons
+from PySide6.QtCore import (
+    QEvent, QObject, QPoint, QPointF, QRect, QRectF, QRunnable, QSize, QThreadPool, QTimer, QUrl, Qt, Signal
+)          # Import Qt core functionalities such as alignment
 #-----------------------------------------------------------------------------------------
 
 
@@ -55,6 +55,149 @@ from Operation.Operation_Bubble_Message import BubbleMessage
 #-----------------------------------------------------------------------------------------
 
 
+#-----------------------------------------------------------------------------------------
+# Decoded icons shared by every chat widget, keyed by resource path
+_ICON_CACHE = {}
+
+def _cached_icon(path):
+    icon = _ICON_CACHE.get(path)
+    if icon is None:
+        icon = _ICON_CACHE[path] = QIcon(utils.resource_path(path))
+    return icon
+#-----------------------------------------------------------------------------------------
+
+
+#-----------------------------------------------------------------------------------------
+# Context menu of the input box, part of _CHAT_QSS so the standard menu picks it up
+_CONTEXT_MENU_QSS = """
+    QMenu {
+        background-color: #ffffff;
+        color: #333333;
+        border: 1px solid #cccccc;
+        border-radius: 8px;
+        padding: 4px;
+    }
+    QMenu::item {
+        background-color: transparent;
+        padding: 2px 8px 2px 8px;
+        border-radius: 6px;
+        margin: 2px 4px;
+    }
+    QMenu::item:selected {
+        background-color: #f0f0f0;
+        color: #000000;
+    }
+    QMenu::separator {
+        height: 1px;
+        background: #dddddd;
+        margin: 4px 0;
+    }
+"""
+
+# Static stylesheet of the chat window, parsed once and applied to Chat_Central_Widget
+_CHAT_QSS = """
+    QWidget {
+        background-color: #F5F5F5;
+    }
+
+    QScrollArea#Chat_Scroll_Area {
+        background: transparent;
+        border: none;
+    }
+    #Chat_Scroll_Area QWidget {
+        background: transparent;
+    }
+    #Chat_Scroll_Area QScrollBar:vertical {
+        background: transparent;
+        width: 10px;
+        margin: 4px 2px 4px 2px;
+        border-radius: 8px;
+    }
+    #Chat_Scroll_Area QScrollBar::handle:vertical {
+        background: rgba(0,0,0,0.25);
+        min-height: 30px;
+        border-radius: 8px;
+    }
+    #Chat_Scroll_Area QScrollBar::handle:vertical:hover {
+        background: rgba(0,0,0,0.45);
+    }
+    #Chat_Scroll_Area QScrollBar::add-line:vertical, #Chat_Scroll_Area QScrollBar::sub-line:vertical { height: 0px; }
+    #Chat_Scroll_Area QScrollBar::add-page:vertical, #Chat_Scroll_Area QScrollBar::sub-page:vertical { background: none; }
+
+    QFrame#Chat_Input_Container {
+        background-color: #FFFFFF;
+        border-radius: 12px;
+        padding: 6px 3px 6px 6px;
+        border: 1px solid rgba(255, 255, 255, 0.2);
+    }
+
+    QTextEdit#Chat_Line_Edit {
+        border: none;
+        background: transparent;
+        font-size: 13pt;
+        line-height: 1.5;
+        padding: 0px 0px 0px 0px;
+    }
+    QTextEdit#Chat_Line_Edit::viewport {
+        background: transparent;
+    }
+    #Chat_Line_Edit QScrollBar:vertical {
+        border: none;
+        background: transparent;
+        width: 8px;
+        margin: 0px 0px 14px 0;
+        border-radius: 4px;
+    }
+    #Chat_Line_Edit QScrollBar::handle:vertical {
+        background: rgba(0, 0, 0, 0.4);
+        min-height: 20px;
+        border-radius: 4px;
+    }
+    #Chat_Line_Edit QScrollBar::handle:vertical:hover {
+        background: rgba(0, 0, 0, 0.6);
+    }
+    #Chat_Line_Edit QScrollBar::add-line:vertical, #Chat_Line_Edit QScrollBar::sub-line:vertical {
+        height: 0px;
+        width: 0px;
+    }
+    #Chat_Line_Edit QScrollBar::add-page:vertical, #Chat_Line_Edit QScrollBar::sub-page:vertical {
+        background: none;
+    }
+    #Chat_Line_Edit QScrollBar:horizontal {
+        border: none;
+        background: rgba(0, 0, 0, 0.1);
+        height: 8px;
+        margin: 0 4px 0 4px;
+        border-radius: 4px;
+    }
+    #Chat_Line_Edit QScrollBar::handle:horizontal {
+        background: rgba(0, 0, 0, 0.4);
+        min-width: 20px;
+        border-radius: 4px;
+    }
+    #Chat_Line_Edit QScrollBar::handle:horizontal:hover {
+        background: rgba(0, 0, 0, 0.6);
+    }
+
+    QFrame#floatingtoptoolbar {
+        background: transparent;
+        border: None;
+    }
+
+    QFrame#floatingtoptoolbar QPushButton, QPushButton#Chat_Send_Button {
+        padding: 0px;
+        margin: 0px;
+        border: none;
+        background: transparent;
+    }
+    QFrame#floatingtoptoolbar QPushButton:hover, QPushButton#Chat_Send_Button:hover {
+        background: #e9ecef;
+        border-radius: 6px;
+    }
+""" + _CONTEXT_MENU_QSS
+#-----------------------------------------------------------------------------------------
+
+
 class AspectRatioLabel(QLabel):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -62,25 +205,77 @@ class AspectRatioLabel(QLabel):
         self.setScaledContents(False)
         self.m_pixmap = None
         self.m_movie = None
+        self._movie_connected = False
+
+        # Last scaled pixmap, keyed by (width, height, source cacheKey)
+        self._cached_scaled = None
+        self._cached_key = None
+
+    def _invalidate_cache(self):
+        self._cached_scaled = None
+        self._cached_key = None
 
     def setPixmap(self, pixmap):
         if self.m_movie:
+            self._set_movie_active(False)
             self.m_movie.stop()
             self.m_movie = None
         self.m_pixmap = pixmap
+        self._invalidate_cache()
         self.update()
 
     def setMovie(self, movie):
         if self.m_movie:
+            self._set_movie_active(False)
             self.m_movie.stop()
         self.m_movie = movie
         self.m_pixmap = None
-        self.m_movie.frameChanged.connect(self.repaint)
+        self._invalidate_cache()
+        self._movie_connected = False
+        if self.m_movie is None:
+            self.update()
+            return
         self.m_movie.start()
+        self._set_movie_active(self.isVisible())
+
+    def _set_movie_active(self, active):
+        """
+        Pause the movie and drop the repaint connection while the label is hidden,
+        resume both when it is shown again.
+        """
+        if not self.m_movie:
+            return
+        if active:
+            if not self._movie_connected:
+                self.m_movie.frameChanged.connect(self.repaint)
+                self._movie_connected = True
+            if self.m_movie.state() == QMovie.Paused:
+                self.m_movie.setPaused(False)
+        else:
+            if self.m_movie.state() == QMovie.Running:
+                self.m_movie.setPaused(True)
+            if self._movie_connected:
+                try:
+                    self.m_movie.frameChanged.disconnect(self.repaint)
+                except (TypeError, RuntimeError):
+                    pass
+                self._movie_connected = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._set_movie_active(True)
+
+    def hideEvent(self, event):
+        self._set_movie_active(False)
+        super().hideEvent(event)
+
+    def resizeEvent(self, event):
+        self._invalidate_cache()
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
+        # The smooth scale happens once per size in scaled(); painting is a plain blit
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
         current_pix = None
         if self.m_movie:
@@ -96,14 +291,118 @@ class AspectRatioLabel(QLabel):
             if img_w == 0 or img_h == 0:
                 return
 
-            ratio = max(win_w / img_w, win_h / img_h)
-            new_w = int(img_w * ratio)
-            new_h = int(img_h * ratio)
+            key = (win_w, win_h, current_pix.cacheKey())
+            if key != self._cached_key:
+                ratio = max(win_w / img_w, win_h / img_h)
+                new_w = int(img_w * ratio)
+                new_h = int(img_h * ratio)
+                self._cached_scaled = current_pix.scaled(
+                    new_w, new_h,
+                    Qt.KeepAspectRatioByExpanding,
+                    Qt.SmoothTransformation
+                )
+                self._cached_key = key
+
+            # Draw only the centred part that is visible instead of cropping a copy
+            pix = self._cached_scaled
+            w = min(win_w, pix.width())
+            h = min(win_h, pix.height())
+            source = QRect((pix.width() - w) // 2, (pix.height() - h) // 2, w, h)
+            target = QRect((win_w - w) // 2, (win_h - h) // 2, w, h)
+            painter.drawPixmap(target, pix, source)
+
+
+
+
+
+class _PixmapLoader(QRunnable):
+    """
+    Decode an image file on a QThreadPool thread and hand the QImage back
+    through signals.loaded(path, image). Converting it to a QPixmap is left
+    to the GUI thread.
+    """
+
+    class Signals(QObject):
+        loaded = Signal(str, QImage)
+
+    def __init__(self, path, scaled_size=None):
+        super().__init__()
+        self.path = path
+        self.scaled_size = scaled_size
+        self.signals = _PixmapLoader.Signals()
+
+    def run(self):
+        reader = QImageReader(self.path)
+        if self.scaled_size is not None:
+            reader.setScaledSize(self.scaled_size)
+        self.signals.loaded.emit(self.path, reader.read())
+
+
+class _InputShadow(QWidget):
+    """
+    Drop shadow drawn behind a floating widget from a cached pixmap.
+
+    The blur is rendered once per size, QGraphicsDropShadowEffect on the
+    target itself would blur again on every repaint (every keystroke).
+    """
+
+    def __init__(self, target, blur=20, offset=3, color=QColor(0, 0, 0, 150), radius=12):
+        super().__init__(target.parentWidget())
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._target = target
+        self._blur = blur
+        self._offset = offset
+        self._color = color
+        self._radius = radius
+        self._pixmap = None
+        target.installEventFilter(self)
+        self._sync()
 
-            x = (win_w - new_w) // 2
-            y = (win_h - new_h) // 2
-            target_rect = QRect(x, y, new_w, new_h)
-            painter.drawPixmap(target_rect, current_pix)
+    def eventFilter(self, obj, event):
+        if obj is self._target and event.type() in (QEvent.Move, QEvent.Resize, QEvent.Show,
+                                                    QEvent.Hide, QEvent.ZOrderChange):
+            self._sync()
+        return False
+
+    def _sync(self):
+        m = self._blur
+        self.setGeometry(self._target.geometry().adjusted(-m, -m, m, m + self._offset))
+        self.setHidden(self._target.isHidden())
+        self.stackUnder(self._target)
+
+    def paintEvent(self, event):
+        if self._pixmap is None or self._pixmap.size() != self.size():
+            self._pixmap = self._render_shadow()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+
+    def _render_shadow(self):
+        m = self._blur
+        source = QPixmap(max(1, self.width() - 2 * m), max(1, self.height() - 2 * m - self._offset))
+        source.fill(Qt.transparent)
+        painter = QPainter(source)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(Qt.white)
+        painter.drawRoundedRect(source.rect(), self._radius, self._radius)
+        painter.end()
+
+        effect = QGraphicsDropShadowEffect()
+        effect.setBlurRadius(m)
+        effect.setColor(self._color)
+        effect.setOffset(QPointF(0, self._offset))
+
+        scene = QGraphicsScene(0, 0, self.width(), self.height())
+        item = scene.addPixmap(source)
+        item.setPos(m, m)
+        item.setGraphicsEffect(effect)
+
+        result = QPixmap(self.size())
+        result.fill(Qt.transparent)
+        painter = QPainter(result)
+        scene.render(painter, QRectF(result.rect()), scene.sceneRect())
+        painter.end()
+        return result
 
 
 
@@ -118,18 +417,23 @@ class Chat_Central_Widget(QWidget):
     new_chat_requested_from_chatwindow          = Signal()
     new_folder_requested_from_chatwindow        = Signal()
 
+    GIF_CACHE_LIMIT = 10 * 1024 * 1024
+
     def __init__(self, parent=None):
 
         super().__init__(parent)
 
-        self._last_send_time = 0
-        self._send_debounce_ms = 300
+        # While this timer runs, further Enter presses are ignored
+        self._send_debounce = self._make_single_shot(300)
 
         self.main_window = parent
 
-        self.setStyleSheet("background-color: #F5F5F5;")
+        self.setObjectName("Chat_Central_Widget")
+        self.setStyleSheet(_CHAT_QSS)
 
         self.pending_images = []
+        self._thumb_count = 0
+        self._thumb_loaders = {}
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -139,61 +443,45 @@ class Chat_Central_Widget(QWidget):
         self.stack_layout = QStackedLayout(self.stack_container)
         self.stack_layout.setStackingMode(QStackedLayout.StackAll)
 
-        self.background_label = QLabel()
         self.background_label = AspectRatioLabel()
         self.background_label.setAlignment(Qt.AlignCenter)
-        self.background_label.setStyleSheet("background-color: #f5f5f5;")
-        self.background_label.setScaledContents(False)
         self.background_label.setMinimumSize(1, 1)
-        self.background_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
 
         self.stack_layout.insertWidget(0, self.background_label)
 
         self.current_background_image_path = None
         self.current_background_is_gif = False
+        self._format_cache = {}
 
-        self.cached_bg_pixmap = None
+        # The decoded background lives in QPixmapCache keyed by its path,
+        # only images larger than the cache budget are held here
+        self._bg_oversized = None
+        self._bg_loader = None
+        self._bg_loading_path = None
+        self._bg_loading_reduced = False
+        self._bg_reduced_paths = set()
 
-        self.resize_timer = QTimer()
-        self.resize_timer.setSingleShot(True)
-        self.resize_timer.setInterval(100)
-        self.resize_timer.timeout.connect(self._perform_high_quality_scale)
+        # Last few scaled backgrounds keyed by (width, height, transform mode)
+        self._scaled_cache = OrderedDict()
+        self._scaled_cache_size = 4
+        self._bg_applied_key = None
+        self._last_hq_size = QSize()
+
+        self.resize_timer = self._make_single_shot(100, self._perform_high_quality_scale)
+
+        # Leading-edge debounce: the first resize is applied at once, later ones
+        # within 40 ms are coalesced into one trailing run
+        self._resize_debounce = self._make_single_shot(40, self._on_resize_debounce)
+        self._resize_trailing = False
 
         self.scroll_area = QScrollArea()
+        self.scroll_area.setObjectName("Chat_Scroll_Area")
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setMinimumWidth(800)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.scroll_area.setFrameShape(QFrame.NoFrame)
-        self.scroll_area.viewport().setStyleSheet("background: transparent;")
-
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background: transparent;
-                border: none;
-            }
-            QScrollArea > QWidget > QWidget { 
-                background: transparent; 
-            }
-            QScrollBar:vertical {
-                background: transparent;
-                width: 10px;
-                margin: 4px 2px 4px 2px;
-                border-radius: 8px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(0,0,0,0.25);
-                min-height: 30px;
-                border-radius: 8px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(0,0,0,0.45);
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
-        """)
 
         self.result_container = QWidget()
-        self.result_container.setStyleSheet("background: transparent;")
         
         self.result_layout = QVBoxLayout(self.result_container)
         self.result_layout.setAlignment(Qt.AlignTop)
@@ -201,7 +489,6 @@ class Chat_Central_Widget(QWidget):
 
         self.bottom_buffer = QWidget()
         self.bottom_buffer.setFixedHeight(150)
-        self.bottom_buffer.setStyleSheet("background: transparent;")
         self.result_layout.addWidget(self.bottom_buffer)
         self.result_layout.addStretch()
 
@@ -214,81 +501,29 @@ class Chat_Central_Widget(QWidget):
 
         self.input_container = QFrame(self)
         self.input_container.setObjectName("Chat_Input_Container")
-        self.input_container.setStyleSheet("""
-            QFrame {
-                background-color: #FFFFFF;
-                border-radius: 12px;
-                padding: 6px 3px 6px 6px;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-            }
-        """)
         self.input_min_height = 40
         self.input_max_height = 120
 
+        # Last applied input geometry, used to skip layout work on keystrokes
+        self._last_input_size = None
+        self._last_input_pos = None
+
         self.input_container.setMinimumHeight(self.input_min_height)
         self.input_container.setMaximumHeight(self.input_max_height)
 
         input_container_layout = QVBoxLayout(self.input_container)
-        input_container_layout.setContentsMargins(0, 0, 0, 0)
         input_container_layout.setContentsMargins(0, 0, 0, 6)
 
         self.chat_line_edit = QTextEdit()
+        self.chat_line_edit.setObjectName("Chat_Line_Edit")
         self.chat_line_edit.setPlaceholderText("Ask anything...")
-        self.chat_line_edit.setStyleSheet("QScrollBar { margin: 0px; }")
-        self.chat_line_edit.setStyleSheet("""
-            QTextEdit {
-                border: none;
-                background: transparent;
-                font-size: 13pt;
-                line-height: 1.5;
-                padding: 0px 0px 0px 0px;
-            }
-            QTextEdit::viewport {
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: transparent;
-                width: 8px;
-                margin: 0px 0px 14px 0;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(0, 0, 0, 0.4);
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(0, 0, 0, 0.6);
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-                width: 0px;
-            }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                background: none;
-            }
-            QScrollBar:horizontal {
-                border: none;
-                background: rgba(0, 0, 0, 0.1);
-                height: 8px;
-                margin: 0 4px 0 4px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:horizontal {
-                background: rgba(0, 0, 0, 0.4);
-                min-width: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background: rgba(0, 0, 0, 0.6);
-            }
-        """)
-
-        self.chat_line_edit.setAlignment(Qt.AlignVCenter)
         self.chat_line_edit.setMinimumHeight(self.input_min_height)
         self.chat_line_edit.setMaximumHeight(self.input_max_height)
-        self.chat_line_edit.textChanged.connect(self.adjust_input_height)
+
+        # Follow the document layout size instead of relaying out on every keystroke
+        doc = self.chat_line_edit.document()
+        self._doc_height = doc.size().height()
+        doc.documentLayout().documentSizeChanged.connect(self._on_doc_size_changed)
 
         self.chat_line_edit.installEventFilter(self)
         self.chat_line_edit.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -298,12 +533,6 @@ class Chat_Central_Widget(QWidget):
 
         self.floating_toptoolbar = QFrame(self)
         self.floating_toptoolbar.setObjectName("floatingtoptoolbar")
-        self.floating_toptoolbar.setStyleSheet("""
-            QFrame#floatingtoptoolbar {
-                background: transparent;
-                border: None;
-            }
-        """)
         self.floating_toptoolbar.setFixedHeight(40)
         self.floating_toptoolbar.setMinimumWidth(self.result_container.width())
 
@@ -313,21 +542,10 @@ class Chat_Central_Widget(QWidget):
 
         def make_btn(icon, text):
             btn = QPushButton()
-            btn.setIcon(QIcon(utils.resource_path(icon)))
+            btn.setIcon(_cached_icon(icon))
             btn.setIconSize(QSize(20, 20))
             btn.setText(text)
             btn.setMinimumWidth(100)
-            btn.setStyleSheet("""
-                QPushButton {
-                    padding: 4px 8px;
-                    background: transparent;
-                    border-radius: 6px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background: rgba(255, 255, 255, 0.15);
-                }
-            """)
             return btn
 
         self.btn_new_folder  = make_btn("images/WIN11-Icons/icons8-folder-100.png", "New folder")
@@ -346,52 +564,19 @@ class Chat_Central_Widget(QWidget):
         toptoolbar_layout.addWidget(self.btn_settings)
         toptoolbar_layout.addStretch()
 
-        for i in range(toptoolbar_layout.count()):
-            btn = toptoolbar_layout.itemAt(i).widget()
-            if isinstance(btn, QPushButton):
-                btn.setStyleSheet("""
-                    QPushButton {
-                        padding: 0px;
-                        margin: 0px;
-                        border: none;
-                        background: transparent;
-                    }
-                    QPushButton:hover {
-                        background: #e9ecef;
-                        border-radius: 6px;
-                    }
-                """)
-
         self.btn_send = QPushButton(self)
-        self.btn_send.setIcon(QIcon(utils.resource_path("images/WIN11-Icons/icons8-enter-100.png")))
+        self.btn_send.setIcon(_cached_icon("images/WIN11-Icons/icons8-enter-100.png"))
         self.btn_send.setIconSize(QSize(22, 22))
         self.btn_send.setToolTip("Send message")
         self.btn_send.setFixedSize(30, 30)
-        self.btn_send.setStyleSheet("""
-            QPushButton {
-                padding: 0px;
-                margin: 0px;
-                border: none;
-                background: transparent;
-            }
-            QPushButton:hover {
-                background: #e9ecef;
-                border-radius: 6px;
-            }
-        """)
+        self.btn_send.setObjectName("Chat_Send_Button")
 
         self.btn_send.clicked.connect(self.on_send_clicked)
-        self.btn_send.raise_()
-
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(20)
-        shadow.setColor(QColor(0, 0, 0, 150))
-        shadow.setOffset(0, 3)
-
-        self.input_container.setGraphicsEffect(shadow)
 
         self.input_container.setParent(self)
-        self.input_container.raise_()
+        self._ensure_zorder()
+
+        self._input_shadow = _InputShadow(self.input_container)
 
         self.messages_count = 0
         self.resizeEvent(None)
@@ -401,60 +586,139 @@ class Chat_Central_Widget(QWidget):
 
 
     #-----------------------------------------------------------------------------
+    def _make_single_shot(self, interval, slot=None):
+        """Create the single-shot timers used for debouncing in this widget."""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(interval)
+        if slot is not None:
+            timer.timeout.connect(slot)
+        return timer
+
     def set_chat_background(self, image_path):
+        if image_path != self.current_background_image_path:
+            self._scaled_cache.clear()
+            self._bg_applied_key = None
+            self._last_hq_size = QSize()
+            self._bg_oversized = None
         if not image_path or not os.path.exists(image_path):
-            if self.background_label.movie():
-                self.background_label.movie().stop()
-                self.background_label.setMovie(None)
-            self.background_label.clear()
-            if hasattr(self.background_label, "m_pixmap"):
-                self.background_label.m_pixmap = None
-                self.background_label.update()
+            # Stops a running GIF and drops the current pixmap
+            self.background_label.setMovie(None)
             self.background_label.setStyleSheet("background-color: #F5F5F5;")
             self.current_background_image_path = None
             self.current_background_is_gif = False
             return
         self.current_background_image_path = image_path
-        is_gif = image_path.lower().endswith(".gif")
+        is_gif = self._is_gif(image_path)
         self.current_background_is_gif = is_gif
         if is_gif:
             movie = QMovie(image_path)
-            movie.setCacheMode(QMovie.CacheAll)
+            # Caching every decoded frame of a large GIF costs hundreds of MB
+            if os.path.getsize(image_path) < self.GIF_CACHE_LIMIT:
+                movie.setCacheMode(QMovie.CacheAll)
+            else:
+                movie.setCacheMode(QMovie.CacheNone)
             self.background_label.setMovie(movie)
         else:
-            pix = QPixmap(image_path)
-            self.background_label.setPixmap(pix)
+            pix = self._background_source()
+            if pix is not None:
+                self.background_label.setPixmap(pix)
         self.background_label.setStyleSheet("background-color: transparent;")
+        self._ensure_zorder()
         print(f"[INFO] Background set to: {image_path}")
 
+    def _is_gif(self, image_path):
+        """Sniff the GIF signature once per path, the file extension can lie."""
+        is_gif = self._format_cache.get(image_path)
+        if is_gif is None:
+            try:
+                with open(image_path, "rb") as f:
+                    is_gif = f.read(6)[:3] == b"GIF"
+            except OSError:
+                is_gif = image_path.lower().endswith(".gif")
+            self._format_cache[image_path] = is_gif
+        return is_gif
+
+    def _background_source(self):
+        """
+        Return the decoded pixmap of the current static background, or None.
+        On a QPixmapCache miss a reload is started and the label keeps what
+        it shows until the image is back.
+        """
+        path = self.current_background_image_path
+        if not path or self.current_background_is_gif:
+            return None
+        pix = self._bg_oversized
+        if pix is None:
+            pix = QPixmapCache.find(path)
+            if pix is None or pix.isNull():
+                self._start_background_load(path)
+                return None
+        # A reduced decode no longer covers the window, decode again at the new size
+        if path in self._bg_reduced_paths and (
+                self.stack_container.width() > pix.width() or
+                self.stack_container.height() > pix.height()):
+            self._start_background_load(path)
+        return pix
+
+    def _background_decode_size(self, path):
+        """
+        Size to decode the background at: about twice the chat area, so the
+        decoder skips most of a large photo. None means full resolution.
+        """
+        if not self.isVisible():
+            return None
+        src = QImageReader(path).size()
+        target = self.stack_container.size() * 2
+        if not src.isValid() or target.isEmpty():
+            return None
+        scale = min(src.width() / target.width(), src.height() / target.height(), 8)
+        if scale > 1.5:
+            return src / int(scale)
+        return None
+
+    def _start_background_load(self, path):
+        if self._bg_loading_path == path:
+            return
+        # Decode off the GUI thread
+        decode_size = self._background_decode_size(path)
+        self._bg_loading_path = path
+        self._bg_loading_reduced = decode_size is not None
+        self._bg_loader = _PixmapLoader(path, decode_size)
+        self._bg_loader.signals.loaded.connect(self._on_background_loaded)
+        QThreadPool.globalInstance().start(self._bg_loader)
+
+    def _on_background_loaded(self, image_path, image):
+        reduced = False
+        if image_path == self._bg_loading_path:
+            reduced = self._bg_loading_reduced
+            self._bg_loader = None
+            self._bg_loading_path = None
+        if image_path != self.current_background_image_path or self.current_background_is_gif:
+            return
+        if image.isNull():
+            print(f"[WARN] Failed to load background: {image_path}")
+            return
+        if reduced:
+            self._bg_reduced_paths.add(image_path)
+        else:
+            self._bg_reduced_paths.discard(image_path)
+        pix = QPixmap.fromImage(image)
+        self._bg_oversized = None if QPixmapCache.insert(image_path, pix) else pix
+        self._scaled_cache.clear()
+        self._bg_applied_key = None
+        self._last_hq_size = QSize()
+        # The label only ever holds a viewport-sized copy, never the full decode
+        self._perform_high_quality_scale()
+        if self._bg_applied_key is None:
+            # Not laid out yet, the first resize scales it down
+            self.background_label.setPixmap(pix)
+
     def show_context_menu(self, pos):
         menu = self.chat_line_edit.createStandardContextMenu()
         menu.setContentsMargins(0,4,0,4)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: #ffffff;
-                color: #333333;
-                border: 1px solid #cccccc;
-                border-radius: 8px;
-                padding: 4px;
-            }
-            QMenu::item {
-                background-color: transparent;
-                padding: 2px 8px 2px 8px;
-                border-radius: 6px;
-                margin: 2px 4px;
-            }
-            QMenu::item:selected {
-                background-color: #f0f0f0;
-                color: #000000;
-            }
-            QMenu::separator {
-                height: 1px;
-                background: #dddddd;
-                margin: 4px 0;
-            }
-        """)
         menu.exec(self.chat_line_edit.mapToGlobal(pos))
+        menu.deleteLater()
 
     def on_send_clicked(self):
         text = self.chat_line_edit.toPlainText().strip()
@@ -464,6 +728,8 @@ class Chat_Central_Widget(QWidget):
         self.send_message_signal.emit(text, images)
         self.chat_line_edit.clear()
         self.pending_images.clear()
+        # Thumbnails still decoding belong to the message just sent
+        self._thumb_loaders.clear()
         self.messages_count += 1
         self.adjust_input_height()
         self.update_input_container_position()
@@ -477,10 +743,9 @@ class Chat_Central_Widget(QWidget):
                     self.chat_line_edit.insertPlainText("\n")
                     return True
                 else:
-                    current_time = QDateTime.currentMSecsSinceEpoch()
-                    if current_time - self._last_send_time >= self._send_debounce_ms:
+                    if not self._send_debounce.isActive():
                         self.on_send_clicked()
-                        self._last_send_time = current_time
+                        self._send_debounce.start()
                     else:
                         print("Send ignored due to debounce")
                     return True
@@ -494,16 +759,47 @@ class Chat_Central_Widget(QWidget):
             self.selected_image = file_name
             print("Image selected:", file_name)
             self.pending_images.append(file_name)
-            cursor = self.chat_line_edit.textCursor()
-            cursor.movePosition(QTextCursor.End)
-            img_format = QTextImageFormat()
+            # Decode straight to an 80x80 thumbnail, the full file is only read when sending
+            self._thumb_count += 1
+            thumb_name = f"chat-thumb:{self._thumb_count}"
+            loader = _PixmapLoader(file_name, QSize(80, 80))
+            loader.signals.loaded.connect(self._on_thumbnail_loaded)
+            self._thumb_loaders[thumb_name] = loader
+            QThreadPool.globalInstance().start(loader)
+
+    def _on_thumbnail_loaded(self, file_name, image):
+        signals = self.sender()
+        for thumb_name, loader in self._thumb_loaders.items():
+            if loader.signals is signals:
+                self._insert_thumbnail(thumb_name, file_name, image)
+                return
+
+    def _insert_thumbnail(self, thumb_name, file_name, image):
+        # Dropped by on_send_clicked: the input box has been cleared since
+        if self._thumb_loaders.pop(thumb_name, None) is None:
+            return
+        img_format = QTextImageFormat()
+        if image.isNull():
             img_format.setName(file_name)
-            img_format.setWidth(80)
-            img_format.setHeight(80)
-            cursor.insertImage(img_format)
-            cursor.insertText(" ")
+        else:
+            self.chat_line_edit.document().addResource(
+                QTextDocument.ImageResource, QUrl(thumb_name), QPixmap.fromImage(image)
+            )
+            img_format.setName(thumb_name)
+        img_format.setWidth(80)
+        img_format.setHeight(80)
+        cursor = self.chat_line_edit.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertImage(img_format)
+        cursor.insertText(" ")
+
+    def _input_layout_ready(self):
+        # Before the first show the scroll area has no real size yet, showEvent redoes the layout
+        return self.isVisible() and self.scroll_area.width() > 0
 
     def update_input_container_position(self):
+        if not self._input_layout_ready():
+            return
         h = self.scroll_area.height()
         box_h = self.input_container.height()
         if self.messages_count == 0:
@@ -512,19 +808,31 @@ class Chat_Central_Widget(QWidget):
             margin = 30
             y = h - box_h - margin
         x = int((self.width() - self.input_container.width()) / 2)
-        self.input_container.move(x, y)
-        self.input_container.raise_()
+        pos_key = (x, y, box_h, self.input_container.width())
+        if pos_key == self._last_input_pos:
+            return
+        self._last_input_pos = pos_key
+        self._move_if_needed(self.input_container, x, y)
         top_btn_offset_y = 28
         bottom_btn_offset_y = box_h - 35
         btn_spacing = 5
         toolbar_y = y - self.floating_toptoolbar.height() - 2
         toolbar_x = x + 5
-        self.floating_toptoolbar.move(toolbar_x, toolbar_y)
+        self._move_if_needed(self.floating_toptoolbar, toolbar_x, toolbar_y)
         fixed_btn_width = 30
         right_margin = 8
         btn_x = x + self.input_container.width() - fixed_btn_width - right_margin
         btn_y = y + box_h - 35
-        self.btn_send.move(btn_x, btn_y)
+        self._move_if_needed(self.btn_send, btn_x, btn_y)
+
+    @staticmethod
+    def _move_if_needed(widget, x, y):
+        if widget.pos() != QPoint(x, y):
+            widget.move(x, y)
+
+    def _ensure_zorder(self):
+        """Keep the floating input box and its buttons above the chat area."""
+        self.input_container.raise_()
         self.btn_image.raise_()
         self.btn_send.raise_()
 
@@ -536,50 +844,79 @@ class Chat_Central_Widget(QWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        if self._resize_debounce.isActive():
+            self._resize_trailing = True
+        else:
+            self._do_resize_work()
+        self._resize_debounce.start()
+
+    def _on_resize_debounce(self):
+        if self._resize_trailing:
+            self._resize_trailing = False
+            self._do_resize_work()
+
+    def _do_resize_work(self):
         if hasattr(self, 'adjust_input_height'):
             self.adjust_input_height()
         self.update_input_container_position()
         if self.current_background_is_gif:
             self._update_background_size()
             return
-        if self.cached_bg_pixmap:
-            self._perform_fast_scale()
+        if self._near_last_hq_size():
+            return
+        self._perform_fast_scale()
         self.resize_timer.start()
 
+    def _near_last_hq_size(self):
+        """
+        True when the background area is within 2 px of the last smooth scale,
+        the label can stretch that pixmap without a visible difference.
+        """
+        last = self._last_hq_size
+        if last.isEmpty():
+            return False
+        return (abs(self.stack_container.width() - last.width()) < 3 and
+                abs(self.stack_container.height() - last.height()) < 3)
+
     def _perform_fast_scale(self):
-        if not self.cached_bg_pixmap: return
-        win_w = self.stack_container.width()
-        win_h = self.stack_container.height()
-        if win_w <= 0 or win_h <= 0: return
-        scaled_pix = self.cached_bg_pixmap.scaled(
-            win_w, win_h,
-            Qt.KeepAspectRatioByExpanding, 
-            Qt.FastTransformation
-        )
-        if scaled_pix.width() > win_w or scaled_pix.height() > win_h:
-            x = (scaled_pix.width() - win_w) // 2
-            y = (scaled_pix.height() - win_h) // 2
-            scaled_pix = scaled_pix.copy(x, y, win_w, win_h)
-        self.background_label.setPixmap(scaled_pix)
+        self._apply_scaled_background(Qt.FastTransformation)
 
     def _perform_high_quality_scale(self):
-        if not self.cached_bg_pixmap: return
+        if self._near_last_hq_size():
+            return
+        source = self._background_source()
+        if source is None:
+            return
+        self._apply_scaled_background(Qt.SmoothTransformation, source)
+        self._last_hq_size = QSize(self.stack_container.width(), self.stack_container.height())
+
+    def _apply_scaled_background(self, mode, source=None):
+        if source is None:
+            source = self._background_source()
+        if source is None: return
         win_w = self.stack_container.width()
         win_h = self.stack_container.height()
         if win_w <= 0 or win_h <= 0: return
-        scaled_pix = self.cached_bg_pixmap.scaled(
-            win_w, win_h,
-            Qt.KeepAspectRatioByExpanding, 
-            Qt.SmoothTransformation
-        )
-        if scaled_pix.width() > win_w or scaled_pix.height() > win_h:
-            x = (scaled_pix.width() - win_w) // 2
-            y = (scaled_pix.height() - win_h) // 2
-            scaled_pix = scaled_pix.copy(x, y, win_w, win_h)
+        key = (win_w, win_h, mode)
+        if key == self._bg_applied_key:
+            return
+        scaled_pix = self._scaled_cache.get(key)
+        if scaled_pix is None:
+            scaled_pix = source.scaled(
+                win_w, win_h,
+                Qt.KeepAspectRatioByExpanding,
+                mode
+            )
+            self._scaled_cache[key] = scaled_pix
+            if len(self._scaled_cache) > self._scaled_cache_size:
+                self._scaled_cache.popitem(last=False)
+        else:
+            self._scaled_cache.move_to_end(key)
         self.background_label.setPixmap(scaled_pix)
+        self._bg_applied_key = key
 
     def _update_background_size(self):
-        if not self.current_background_is_gif:
+        if not self.current_background_is_gif or not self.isVisible():
             return
         movie = self.background_label.movie()
         if not movie or not movie.isValid():
@@ -601,15 +938,26 @@ class Chat_Central_Widget(QWidget):
         if abs(current_movie_size.width() - new_w) > 2 or abs(current_movie_size.height() - new_h) > 2:
             movie.setScaledSize(QSize(new_w, new_h))
 
+    def _on_doc_size_changed(self, size):
+        if size.height() != self._doc_height:
+            self._doc_height = size.height()
+            self.adjust_input_height()
+
     def adjust_input_height(self):
-        doc_height = self.chat_line_edit.document().size().height() + 10
+        if not self._input_layout_ready():
+            return
+        doc_height = self._doc_height + 10
         new_height = int(max(self.input_min_height, min(self.input_max_height, doc_height)))
         curr_height = self.input_container.height()
         if self.messages_count == 0:
             new_width = int(0.75 * self.scroll_area.width())
         else:
             new_width = int(0.95 * self.scroll_area.width())
-        self.input_container.setFixedWidth(new_width)
+        if (new_width, new_height) == self._last_input_size and new_height == curr_height:
+            return
+        self._last_input_size = (new_width, new_height)
+        if new_width != self.input_container.width():
+            self.input_container.setFixedWidth(new_width)
         if new_height != curr_height:
             geo = self.input_container.geometry()
             current_bottom_y = geo.y() + geo.height()
@@ -6,7 +6,7 @@
 #----------------------------------------------------------------------------------------- 
 
 import sys
-import os
+import functools
 from pathlib import Path
 
 #-----------------------------------------------------------------------------------------
@@ -25,27 +25,148 @@ try:
 except ImportError:
     class Utils:
         def get_usr_dir(self): return Path("usr")
+        def get_settings_path(self): return self.get_usr_dir() / "settings.ini"
     utils = Utils()
 #-----------------------------------------------------------------------------------------
 
+#-----------------------------------------------------------------------------------------
+# Keys shown in the dialog: key -> (default, type). Read in one pass into Setting_Window._snap
+DEFAULTS = {
+    "AI/provider":                ("OpenRouter (Recommended)", str),
+    "AI/base_url":                ("https://openrouter.ai/api/v1/chat/completions", str),
+    "AI/api_key":                 ("", str),
+    "AI/system_prompt":           ("You are a helpful assistant.", str),
+    "AI/temperature":             (0.7, float),
+    "Appearance/theme":           ("Light", str),
+    "Appearance/toolbar_icons":   (True, bool),
+    "Appearance/chat_background": ("", str),
+    "Font/type":                  ("Microsoft YaHei", str),
+    "Font/size":                  ("10", str),
+    "Language/type":              ("English", str),
+    "Search/Google":              (False, bool),
+}
+
+_PROVIDER_URL_MAP = {
+    "OpenRouter (Recommended)": "https://openrouter.ai/api/v1/chat/completions",
+    "OpenAI (Official)": "https://api.openai.com/v1/chat/completions",
+    "Alibaba Qwen (DashScope)": "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions",
+    "DeepSeek (Official)": "https://api.deepseek.com/chat/completions",
+    "X.AI (Grok)": "https://api.x.ai/v1/chat/completions",
+    "Groq (Meta Llama/Mixtral)": "https://api.groq.com/openai/v1/chat/completions",
+    "Google Gemini (via OpenRouter)": "https://openrouter.ai/api/v1/chat/completions",
+    "SiliconFlow (硅基流动)": "https://api.siliconflow.cn/v1/chat/completions",
+    "Ollama (Localhost)": "http://localhost:11434/v1/chat/completions",
+    "Arli": "https://api.arliai.com/v1/chat/completions",
+}
+
+_FONT_LIST = (
+    "Arial", "Calibri", "Times New Roman", "Courier New",
+    "Microsoft YaHei", "SimHei", "SimSun",
+    "KaiTi", "FangSong",
+    "STHeiti", "STKaiti", "STSong", "STFangsong", "PingFang SC",
+)
+
+_FONT_SIZES = tuple(str(size) for size in range(8, 30))
+
+# Kept on the tree itself: theme changes replace the application stylesheet
+_PREF_TREE_QSS = """
+    QTreeWidget#PrefTree {
+        border: 1px solid #D3D3D3;
+        border-radius: 8px;
+        padding: 0px;
+    }
+    QTreeWidget#PrefTree::item { padding: 8px; color: #333333; }
+    QTreeWidget#PrefTree::item:hover { background-color: #E8E8E8; }
+    QTreeWidget#PrefTree::item:selected { background-color: #DCDCDC; color: #333333; }
+"""
+#-----------------------------------------------------------------------------------------
+
 class Setting_Window(QDialog):
 
     settings_page_operation_signal = Signal(str)
     apply_settings_signal = Signal()
 
+    PROVIDERS = (
+        "OpenRouter (Recommended)", 
+        "OpenAI (Official)",
+        "Alibaba Qwen (DashScope)", 
+        "DeepSeek (Official)", 
+        "X.AI (Grok)", 
+        "Groq (Meta Llama/Mixtral)",
+        "Google Gemini (via OpenRouter)",
+        "SiliconFlow (硅基流动)", 
+        "Ollama (Localhost)",
+        "Arli", 
+        "Custom" 
+    )
+    # Lower-cased provider name -> combo box index
+    PROVIDER_INDEX = {name.lower(): i for i, name in enumerate(PROVIDERS)}
+
+    @classmethod
+    def find_provider_index(cls, provider):
+        """
+        Return the combo index of the first provider whose name contains `provider`
+        (case-insensitive), or -1 if there is no match.
+        """
+        provider_lower = provider.lower().strip()
+        found_index = cls.PROVIDER_INDEX.get(provider_lower)
+        if found_index is not None:
+            return found_index
+        return next((i for key, i in cls.PROVIDER_INDEX.items() if provider_lower in key), -1)
+
+    # Always-present texts: (translation key, setter)
+    _I18N_MAP = (
+        ("Preferences",       lambda s, t: s.setWindowTitle(t)),
+        ("AI Configuration",  lambda s, t: s.item_ai.setText(0, t)),
+        ("Appearance",        lambda s, t: s.item_appearance.setText(0, t)),
+        ("Font Settings",     lambda s, t: s.item_font.setText(0, t)),
+        ("Language Settings", lambda s, t: s.item_language.setText(0, t)),
+        ("Search",            lambda s, t: s.item_search.setText(0, t)),
+        ("Save",              lambda s, t: s.button_box.button(QDialogButtonBox.Ok).setText(t)),
+        ("Cancel",            lambda s, t: s.button_box.button(QDialogButtonBox.Cancel).setText(t)),
+    )
+
+    # Per page: (widget attribute, setter, translation key)
+    _PAGE_TEXTS = {
+        "item_ai": (
+            ("group_ai_api",      "setTitle", "API Connection"),
+            ("lbl_provider",      "setText",  "Provider"),
+            ("lbl_base_url",      "setText",  "Base URL"),
+            ("lbl_api_key",       "setText",  "API Key"),
+            ("group_ai_behavior", "setTitle", "Behavior"),
+            ("lbl_sys_prompt",    "setText",  "System Prompt"),
+            ("lbl_temperature",   "setText",  "Temperature"),
+            ("btn_reset_ai",      "setText",  "Reset"),
+        ),
+        "item_appearance": (
+            ("group_theme",        "setTitle", "Theme & UI"),
+            ("lbl_theme_mode",     "setText",  "Theme mode:"),
+            ("chk_toolbar_icons",  "setText",  "Show toolbar icons"),
+            ("group_bg",           "setTitle", "Chat Background"),
+            ("lbl_bg_instruction", "setText",  "Select a custom background image (JPG, PNG, GIF):"),
+            ("btn_browse_bg",      "setText",  "Browse Image..."),
+            ("btn_clear_bg",       "setText",  "Clear / Reset"),
+        ),
+        "item_font": (
+            ("group_font",    "setTitle", "Font Settings"),
+            ("lbl_font_type", "setText",  "Font type:"),
+            ("lbl_font_size", "setText",  "Font size:"),
+        ),
+        "item_language": (
+            ("group_language", "setTitle", "Language Settings"),
+            ("lbl_lang_type",  "setText",  "Select Language"),
+        ),
+        "item_search": (
+            ("lbl_search_engine", "setText", "Search engine:"),
+        ),
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.setWindowTitle("Preferences")
         self.resize(700, 550) 
 
-        #---------------------------------------------------------------------------------
-        usr_folder = utils.get_usr_dir()
-        os.makedirs(usr_folder, exist_ok = True)
-        setting_file_path = usr_folder / "settings.ini"
-        self.settings = QSettings(str(setting_file_path), QSettings.Format.IniFormat)
-        #---------------------------------------------------------------------------------
-
         #---------------------------------------------------------------------------------
         main_layout = QHBoxLayout()
 
@@ -69,16 +190,8 @@ class Setting_Window(QDialog):
         ])
         self.preference_tree.setIndentation(0)
 
-        self.preference_tree.setStyleSheet("""
-            QTreeWidget {
-                border: 1px solid #D3D3D3;
-                border-radius: 8px;
-                padding: 0px;
-            }
-            QTreeWidget::item { padding: 8px; color: #333333; }
-            QTreeWidget::item:hover { background-color: #E8E8E8; }
-            QTreeWidget::item:selected { background-color: #DCDCDC; color: #333333; }
-        """)
+        self.preference_tree.setObjectName("PrefTree")
+        self.preference_tree.setStyleSheet(_PREF_TREE_QSS)
 
         self.stack = QStackedWidget()
         main_layout.addWidget(self.stack)
@@ -87,17 +200,19 @@ class Setting_Window(QDialog):
             "AI": {}, "Font": {}, "Search": {}, "Language": {}, "Appearance": {}
         }
 
-        self.ai_page = self.create_ai_page_in_setting()
-        self.appearance_page = self.create_appearance_page_in_setting()
-        self.font_page = self.create_font_page_in_setting()
-        self.language_page = self.create_language_page_in_setting()
-        self.search_page = self.create_search_page_in_setting()
-
-        self.stack.addWidget(self.ai_page)
-        self.stack.addWidget(self.appearance_page)
-        self.stack.addWidget(self.font_page)
-        self.stack.addWidget(self.language_page)
-        self.stack.addWidget(self.search_page)
+        # Pages are built the first time their tree item is selected, until then
+        # an empty placeholder keeps the stack index of every page
+        self._page_builders = {
+            self.item_ai:         self.create_ai_page_in_setting,
+            self.item_appearance: self.create_appearance_page_in_setting,
+            self.item_font:       self.create_font_page_in_setting,
+            self.item_language:   self.create_language_page_in_setting,
+            self.item_search:     self.create_search_page_in_setting,
+        }
+        self._item_to_page = {}
+        self._lang_manager = None
+        for _ in self._page_builders:
+            self.stack.addWidget(QWidget())
 
         self.preference_tree.currentItemChanged.connect(self.change_page)
         self.preference_tree.setCurrentItem(self.item_ai)
@@ -110,6 +225,17 @@ class Setting_Window(QDialog):
         layout.addLayout(main_layout)
         layout.addWidget(self.button_box)
 
+    #-------------------------------------------------------------------------------------
+    @functools.cached_property
+    def settings(self):
+        return QSettings(str(utils.get_settings_path()), QSettings.Format.IniFormat)
+
+    @functools.cached_property
+    def _snap(self):
+        """All values the pages display, read from settings.ini in one pass."""
+        return {key: self.settings.value(key, default, type=value_type)
+                for key, (default, value_type) in DEFAULTS.items()}
+
     #-------------------------------------------------------------------------------------
     def create_ai_page_in_setting(self):
         page = QWidget()
@@ -120,21 +246,9 @@ class Setting_Window(QDialog):
 
         self.lbl_provider = QLabel("Provider:")
         self.provider_combo = QComboBox()
-        self.provider_combo.addItems([
-            "OpenRouter (Recommended)", 
-            "OpenAI (Official)",
-            "Alibaba Qwen (DashScope)", 
-            "DeepSeek (Official)", 
-            "X.AI (Grok)", 
-            "Groq (Meta Llama/Mixtral)",
-            "Google Gemini (via OpenRouter)",
-            "SiliconFlow (硅基流动)", 
-            "Ollama (Localhost)",
-            "Arli", 
-            "Custom" 
-        ])
+        self.provider_combo.addItems(list(self.PROVIDERS))
         
-        saved_provider = self.settings.value("AI/provider", "OpenRouter (Recommended)")
+        saved_provider = self._snap["AI/provider"]
         self.provider_combo.setCurrentText(saved_provider)
         self.provider_combo.currentTextChanged.connect(self._on_provider_changed)
         self.controls["AI"]["provider"] = self.provider_combo
@@ -142,15 +256,14 @@ class Setting_Window(QDialog):
         self.lbl_base_url = QLabel("Base URL:")
         base_url_input = QLineEdit()
         base_url_input.setPlaceholderText("https://...")
-        default_url = "https://openrouter.ai/api/v1/chat/completions"
-        base_url_input.setText(self.settings.value("AI/base_url", default_url))
+        base_url_input.setText(self._snap["AI/base_url"])
         self.controls["AI"]["base_url"] = base_url_input
 
         self.lbl_api_key = QLabel("API Key:")
         api_input = QLineEdit()
         api_input.setEchoMode(QLineEdit.EchoMode.Password)
         api_input.setPlaceholderText("sk-...")
-        api_input.setText(self.settings.value("AI/api_key", ""))
+        api_input.setText(self._snap["AI/api_key"])
         self.controls["AI"]["api_key"] = api_input
 
         api_layout.addRow(self.lbl_provider, self.provider_combo)
@@ -166,7 +279,7 @@ class Setting_Window(QDialog):
         sys_prompt = QTextEdit()
         sys_prompt.setPlaceholderText("You are a helpful assistant...")
         sys_prompt.setMaximumHeight(60)
-        sys_prompt.setPlainText(self.settings.value("AI/system_prompt", "You are a helpful assistant."))
+        sys_prompt.setPlainText(self._snap["AI/system_prompt"])
         self.controls["AI"]["system_prompt"] = sys_prompt
 
         self.lbl_temperature = QLabel("Temperature:")
@@ -176,15 +289,16 @@ class Setting_Window(QDialog):
         
         temp_slider = QSlider(Qt.Orientation.Horizontal)
         temp_slider.setRange(0, 20) 
-        saved_temp = int(float(self.settings.value("AI/temperature", 0.7)) * 10)
+        saved_temp = int(self._snap["AI/temperature"] * 10)
         temp_slider.setValue(saved_temp)
         
-        temp_label = QLabel(str(saved_temp / 10.0))
-        temp_label.setFixedWidth(30)
-        temp_slider.valueChanged.connect(lambda v: temp_label.setText(str(v/10.0)))
+        self._temp_label = QLabel()
+        self._temp_label.setFixedWidth(30)
+        self._on_temp(saved_temp)
+        temp_slider.valueChanged.connect(self._on_temp)
         
         temp_h.addWidget(temp_slider)
-        temp_h.addWidget(temp_label)
+        temp_h.addWidget(self._temp_label)
         self.controls["AI"]["temperature"] = temp_slider
 
         behavior_layout.addRow(self.lbl_sys_prompt, sys_prompt)
@@ -199,21 +313,13 @@ class Setting_Window(QDialog):
         layout.addStretch()
         return page
 
+    def _on_temp(self, value):
+        self._temp_label.setText(f"{value * 0.1:.1f}")
+
     def _on_provider_changed(self, provider_name):
-        url_map = {
-            "OpenRouter (Recommended)": "https://openrouter.ai/api/v1/chat/completions",
-            "OpenAI (Official)": "https://api.openai.com/v1/chat/completions",
-            "Alibaba Qwen (DashScope)": "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions",
-            "DeepSeek (Official)": "https://api.deepseek.com/chat/completions",
-            "X.AI (Grok)": "https://api.x.ai/v1/chat/completions",
-            "Groq (Meta Llama/Mixtral)": "https://api.groq.com/openai/v1/chat/completions",
-            "Google Gemini (via OpenRouter)": "https://openrouter.ai/api/v1/chat/completions",
-            "SiliconFlow (硅基流动)": "https://api.siliconflow.cn/v1/chat/completions",
-            "Ollama (Localhost)": "http://localhost:11434/v1/chat/completions",
-            "Arli": "https://api.arliai.com/v1/chat/completions"
-        }
-        if provider_name in url_map:
-            self.controls["AI"]["base_url"].setText(url_map[provider_name])
+        url = _PROVIDER_URL_MAP.get(provider_name)
+        if url:
+            self.controls["AI"]["base_url"].setText(url)
 
     #-------------------------------------------------------------------------------------
     def create_appearance_page_in_setting(self):
@@ -228,11 +334,11 @@ class Setting_Window(QDialog):
         self.lbl_theme_mode = QLabel("Theme mode:")
         mode_combo = QComboBox()
         mode_combo.addItems(["Light"])
-        mode_combo.setCurrentText(self.settings.value("Appearance/theme", "Light"))
+        mode_combo.setCurrentText(self._snap["Appearance/theme"])
         self.controls["Appearance"]["theme"] = mode_combo
         
         self.chk_toolbar_icons = QCheckBox("Show toolbar icons")
-        self.chk_toolbar_icons.setChecked(self.settings.value("Appearance/toolbar_icons", True, type=bool))
+        self.chk_toolbar_icons.setChecked(self._snap["Appearance/toolbar_icons"])
         self.controls["Appearance"]["toolbar_icons"] = self.chk_toolbar_icons
 
         form.addRow(self.lbl_theme_mode, mode_combo)
@@ -246,7 +352,7 @@ class Setting_Window(QDialog):
         self.bg_path_input = QLineEdit()
         self.bg_path_input.setPlaceholderText("No image selected (Default)")
         self.bg_path_input.setReadOnly(True)
-        saved_bg = self.settings.value("Appearance/chat_background", "")
+        saved_bg = self._snap["Appearance/chat_background"]
         self.bg_path_input.setText(saved_bg)
         self.controls["Appearance"]["chat_background"] = self.bg_path_input
 
@@ -286,22 +392,16 @@ class Setting_Window(QDialog):
 
         self.lbl_font_type = QLabel("Font type:")
         font_combo = QComboBox()
-        font_list = [
-            "Arial", "Calibri", "Times New Roman", "Courier New", 
-            "Microsoft YaHei", "SimHei", "SimSun", 
-            "KaiTi", "FangSong", 
-            "STHeiti", "STKaiti", "STSong", "STFangsong", "PingFang SC"
-        ]
-        font_combo.addItems(font_list)
-        font_combo.setCurrentText(self.settings.value("Font/type", "Microsoft YaHei"))
+        font_combo.addItems(_FONT_LIST)
+        font_combo.setCurrentText(self._snap["Font/type"])
         font_layout.addWidget(self.lbl_font_type)
         font_layout.addWidget(font_combo)
         self.controls["Font"]["type"] = font_combo
 
         self.lbl_font_size = QLabel("Font size:")
         size_combo = QComboBox()
-        size_combo.addItems([str(s) for s in range(8, 30)])
-        size_combo.setCurrentText(self.settings.value("Font/size", "10"))
+        size_combo.addItems(_FONT_SIZES)
+        size_combo.setCurrentText(self._snap["Font/size"])
         font_layout.addWidget(self.lbl_font_size)
         font_layout.addWidget(size_combo)
         self.controls["Font"]["size"] = size_combo
@@ -319,7 +419,7 @@ class Setting_Window(QDialog):
         self.lbl_lang_type = QLabel("Language type:")
         language_combo = QComboBox()
         language_combo.addItems(["English", "Chinese"])
-        language_combo.setCurrentText(self.settings.value("Language/type", "English"))
+        language_combo.setCurrentText(self._snap["Language/type"])
         lang_layout.addWidget(self.lbl_lang_type)
         lang_layout.addWidget(language_combo)
         self.controls["Language"]["type"] = language_combo
@@ -336,7 +436,7 @@ class Setting_Window(QDialog):
         baidu_radio = QRadioButton("Baidu")
         google_radio = QRadioButton("Google")
         
-        if self.settings.value("Search/Google", False, type=bool):
+        if self._snap["Search/Google"]:
             google_radio.setChecked(True)
         else:
             baidu_radio.setChecked(True)
@@ -354,81 +454,91 @@ class Setting_Window(QDialog):
         layout.addStretch()
         return page
 
+    def _ensure_page(self, item):
+        page = self._item_to_page.get(item)
+        if page is None and item in self._page_builders:
+            index = list(self._page_builders).index(item)
+            placeholder = self.stack.widget(index)
+            page = self._page_builders[item]()
+            self.stack.insertWidget(index, page)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self._item_to_page[item] = page
+            if self._lang_manager:
+                self.update_ui_texts(self._lang_manager)
+        return page
+
     def change_page(self, current, previous):
         if not current: return
-        
-        if current == self.item_ai:
-            self.stack.setCurrentWidget(self.ai_page)
-        elif current == self.item_appearance:
-            self.stack.setCurrentWidget(self.appearance_page)
-        elif current == self.item_font:
-            self.stack.setCurrentWidget(self.font_page)
-        elif current == self.item_language:
-            self.stack.setCurrentWidget(self.language_page)
-        elif current == self.item_search:
-            self.stack.setCurrentWidget(self.search_page)
 
-    def update_ui_texts(self, lang_manager):
-        if not lang_manager: return
-        
-        self.setWindowTitle(lang_manager.get_text("Preferences"))
+        page = self._ensure_page(current)
+        if page is None: return
 
-        self.item_ai.setText(0, lang_manager.get_text("AI Configuration"))
-        self.item_appearance.setText(0, lang_manager.get_text("Appearance"))
-        self.item_font.setText(0, lang_manager.get_text("Font Settings"))
-        self.item_language.setText(0, lang_manager.get_text("Language Settings"))
-        self.item_search.setText(0, lang_manager.get_text("Search"))
+        # One repaint for the incoming page instead of intermediate ones
+        self.stack.setUpdatesEnabled(False)
+        try:
+            self.stack.setCurrentWidget(page)
+        finally:
+            self.stack.setUpdatesEnabled(True)
 
-        self.button_box.button(QDialogButtonBox.Ok).setText(lang_manager.get_text("Save"))
-        self.button_box.button(QDialogButtonBox.Cancel).setText(lang_manager.get_text("Cancel"))
-
-        self.group_ai_api.setTitle(lang_manager.get_text("API Connection"))
-        self.lbl_provider.setText(lang_manager.get_text("Provider"))
-        self.lbl_base_url.setText(lang_manager.get_text("Base URL"))
-        self.lbl_api_key.setText(lang_manager.get_text("API Key"))
-        
-        self.group_ai_behavior.setTitle(lang_manager.get_text("Behavior"))
-        self.lbl_sys_prompt.setText(lang_manager.get_text("System Prompt"))
-        self.lbl_temperature.setText(lang_manager.get_text("Temperature"))
-        self.btn_reset_ai.setText(lang_manager.get_text("Reset"))
-
-        self.group_theme.setTitle(lang_manager.get_text("Theme & UI"))
-        self.lbl_theme_mode.setText(lang_manager.get_text("Theme mode:"))
-        self.chk_toolbar_icons.setText(lang_manager.get_text("Show toolbar icons"))
+    def update_ui_texts(self, lang_manager):
+        if not lang_manager: return
+        self._lang_manager = lang_manager
         
-        self.group_bg.setTitle(lang_manager.get_text("Chat Background"))
-        self.lbl_bg_instruction.setText(lang_manager.get_text("Select a custom background image (JPG, PNG, GIF):"))
-        self.btn_browse_bg.setText(lang_manager.get_text("Browse Image..."))
-        self.btn_clear_bg.setText(lang_manager.get_text("Clear / Reset"))
+        for key, setter in self._I18N_MAP:
+            setter(self, lang_manager.get_text(key))
 
-        self.group_font.setTitle(lang_manager.get_text("Font Settings"))
-        self.lbl_font_type.setText(lang_manager.get_text("Font type:"))
-        self.lbl_font_size.setText(lang_manager.get_text("Font size:"))
-
-        self.group_language.setTitle(lang_manager.get_text("Language Settings"))
-        self.lbl_lang_type.setText(lang_manager.get_text("Select Language"))
-
-        self.lbl_search_engine.setText(lang_manager.get_text("Search engine:"))
+        # Pages that were never opened have no widgets to translate yet
+        for item_name, entries in self._PAGE_TEXTS.items():
+            if getattr(self, item_name) not in self._item_to_page:
+                continue
+            for widget_name, method, key in entries:
+                getattr(getattr(self, widget_name), method)(lang_manager.get_text(key))
 
     def accept(self):
+        # Only pages that were opened can hold changes, the rest keep their saved values
+        s = self.settings
         ai = self.controls["AI"]
-        self.settings.setValue("AI/provider", ai["provider"].currentText())
-        self.settings.setValue("AI/base_url", ai["base_url"].text().strip())
-        self.settings.setValue("AI/api_key", ai["api_key"].text().strip())
-        self.settings.setValue("AI/system_prompt", ai["system_prompt"].toPlainText().strip())
-        self.settings.setValue("AI/temperature", ai["temperature"].value() / 10.0)
-        
-        self.settings.setValue("Appearance/theme", self.controls["Appearance"]["theme"].currentText())
-        self.settings.setValue("Appearance/toolbar_icons", self.controls["Appearance"]["toolbar_icons"].isChecked())
-        self.settings.setValue("Appearance/chat_background", self.controls["Appearance"]["chat_background"].text())
-
-        self.settings.setValue("Font/type", self.controls["Font"]["type"].currentText())
-        self.settings.setValue("Font/size", self.controls["Font"]["size"].currentText())
-        self.settings.setValue("Language/type", self.controls["Language"]["type"].currentText())
-        self.settings.setValue("Search/Baidu", self.controls["Search"]["Baidu"].isChecked())
-        self.settings.setValue("Search/Google", self.controls["Search"]["Google"].isChecked())
-
-        self.settings.sync()
+        if ai:
+            s.beginGroup("AI")
+            s.setValue("provider", ai["provider"].currentText())
+            s.setValue("base_url", ai["base_url"].text().strip())
+            s.setValue("api_key", ai["api_key"].text().strip())
+            s.setValue("system_prompt", ai["system_prompt"].toPlainText().strip())
+            s.setValue("temperature", ai["temperature"].value() / 10.0)
+            s.endGroup()
+
+        appearance = self.controls["Appearance"]
+        if appearance:
+            s.beginGroup("Appearance")
+            s.setValue("theme", appearance["theme"].currentText())
+            s.setValue("toolbar_icons", appearance["toolbar_icons"].isChecked())
+            s.setValue("chat_background", appearance["chat_background"].text())
+            s.endGroup()
+
+        font = self.controls["Font"]
+        if font:
+            s.beginGroup("Font")
+            s.setValue("type", font["type"].currentText())
+            s.setValue("size", font["size"].currentText())
+            s.endGroup()
+
+        if self.controls["Language"]:
+            s.beginGroup("Language")
+            s.setValue("type", self.controls["Language"]["type"].currentText())
+            s.endGroup()
+
+        search = self.controls["Search"]
+        if search:
+            s.beginGroup("Search")
+            s.setValue("Baidu", search["Baidu"].isChecked())
+            s.setValue("Google", search["Google"].isChecked())
+            s.endGroup()
+
+        # One flush to disk for the whole dialog
+        s.sync()
+        # Pages built later must see the values just saved
+        self.__dict__.pop("_snap", None)
         self.settings_page_operation_signal.emit("Settings saved successfully!")
         self.apply_settings_signal.emit()
         super().accept()
@@ -446,12 +556,3 @@ class Setting_Window(QDialog):
         ai["temperature"].setValue(7)
         
         QMessageBox.information(self, "Reset", "AI Settings reset to defaults.")
-
-    def get_api_key(self):
-        return self.settings.value("AI/api_key", "", type=str)
-
-    def get_base_url(self):
-        return self.settings.value("AI/base_url", "", type=str)
-
-    def get_system_prompt(self):
-        return self.settings.value("AI/system_prompt", "You are a helpful assistant.", type=str)
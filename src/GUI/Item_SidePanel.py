@@ -7,19 +7,20 @@
 
 
 from pathlib import Path
+import os
 import json
 import time
 from datetime import datetime
 import shutil  # For file operations like delete
-import re
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QListWidgetItem,
-    QLineEdit, QFrame, QMenu, QSizePolicy
+    QLineEdit, QFrame, QMenu, QSizePolicy, QListView, QStyledItemDelegate, QStyleOptionViewItem,
+    QStyle, QApplication
 )
-from PySide6.QtCore import Qt, QSize, Signal, QEvent
-from PySide6.QtGui import QIcon
-from Utils.Utils import utils
+from PySide6.QtCore import Qt, QEvent, QPersistentModelIndex, QRect, QSize, QTimer, Signal
+from PySide6.QtGui import QColor, QIcon, QPainter, QPixmap
+from Utils.Utils import ChatStore, DiskWriter, qthrottled, utils
 
 
 # ============================================================================
@@ -27,6 +28,8 @@ from Utils.Utils import utils
 # These functions are placed near file-operation functions for easier maintenance.
 # ============================================================================
 
+_FORBIDDEN_TABLE = str.maketrans({c: '_' for c in '/\\:*?"<>|'})
+
 def sanitize_filename(name: str, max_len: int = 200) -> str:
     """
     Produce a filesystem-safe filename stem from an arbitrary title.
@@ -39,10 +42,10 @@ def sanitize_filename(name: str, max_len: int = 200) -> str:
         name = str(name)
 
     # Replace known forbidden characters with underscore
-    cleaned = re.sub(r'[\/\\\:\*\?\"\<\>\|]', '_', name)
+    cleaned = name.translate(_FORBIDDEN_TABLE)
 
-    # Collapse whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    # Collapse whitespace (split() also drops leading/trailing runs)
+    cleaned = ' '.join(cleaned.split())
 
     # Trim to max_len
     if len(cleaned) > max_len:
@@ -58,124 +61,117 @@ def sanitize_filename(name: str, max_len: int = 200) -> str:
     return cleaned
 
 
+# Inline chat rename editor, parsed once as part of the side panel stylesheet
+_RENAME_EDITOR_QSS = """
+    QLineEdit#ChatRenameEditor {
+        background-color: transparent;
+        border: 1px solid #0078D4;
+        border-radius: 4px;
+        padding-left: 4px;
+        font-size: 14px;
+        color: #333;
+    }
+    QLineEdit#ChatRenameEditor:focus { border: 1px solid #0078D4; }
+"""
+
+
+class _RenameLineEdit(QLineEdit):
+    """Line edit that always finishes editing on focus out, even when unchanged."""
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.editingFinished.emit()
+
+
 # ============================================================================
-# Chat Item Widget
+# Chat Item Delegate
 # ----------------------------------------------------------------------------
-# A single row representing a chat inside the history list.
-# Supports inline renaming (Enter or focus out commits) and uses the parent
-# side-panel to synchronize rename on disk.
+# Chat rows are plain QListWidgetItems painted by this delegate (icon + title),
+# so the list never builds a QWidget per chat. Inline renaming uses the
+# delegate editor (Enter or focus out commits) and the side panel renames the
+# file on disk.
 # ============================================================================
 
-class ChatItemWidget(QWidget):
+class ChatItemDelegate(QStyledItemDelegate):
     """
-    A QWidget representing a single chat item in the history list.
-    Supports inline renaming like folders:
-    - Click outside or lose focus finishes editing
-    - Press Enter finishes editing
-    - Transparent background
+    Paints chat rows of the history list and provides their rename editor.
+    Folder rows keep their CollapsibleFolder widget, only their background is drawn here.
     """
-    def __init__(self, chat_title, icon_path, parent_listwidget_item, folder_name, history_list, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.parent_item = parent_listwidget_item
-        self.folder_name = folder_name
-        self.history_list = history_list
-        self.editor = None
-
-        self.setStyleSheet("background-color: transparent;")
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(32, 0, 0, 0)
-        layout.setSpacing(6)
-
-        # Icon
-        self.icon = QLabel()
-        self.icon.setPixmap(QIcon(icon_path).pixmap(16, 16))
-        self.icon.setStyleSheet("background-color: transparent;")
-        layout.addWidget(self.icon)
-
-        # Title label
-        self.label = QLabel(chat_title)
-        self.label.setStyleSheet("color:#333; background-color: transparent;")
-        layout.addWidget(self.label)
-        layout.addStretch()
-
-    # ---------------- Inline rename ----------------
-    def start_rename(self):
-        if self.editor:
+    ICON_X = 32
+    ICON_SIZE = 16
+    SPACING = 6
+
+    def __init__(self, side_panel):
+        super().__init__(side_panel)
+        self.side_panel = side_panel
+        self._editing = None  # QPersistentModelIndex of the row being renamed
+
+    def _title_rect(self, rect):
+        x = rect.left() + self.ICON_X + self.ICON_SIZE + self.SPACING
+        return QRect(x, rect.top(), max(0, rect.right() - x - self.SPACING), rect.height())
+
+    def paint(self, painter, option, index):
+        data = index.data(Qt.UserRole)
+        if not data or data[1] == "":
+            super().paint(painter, option, index)
             return
 
-        self.editor = QLineEdit(self.label.text(), self)
-        self.editor.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-        self.editor.setStyleSheet("""
-            QLineEdit {
-                background-color: transparent;
-                border: 1px solid #0078D4;
-                border-radius: 4px;
-                padding-left: 4px;
-                font-size: 14px;
-                color: #333;
-            }
-            QLineEdit:focus { border: 1px solid #0078D4; }
-        """)
-        self.editor.setFixedHeight(self.label.height())
-        self.editor.setFixedWidth(max(self.label.width() + 60, 120))
-        self.editor.move(self.label.pos())
-        self.editor.show()
-        self.editor.setFocus()
-        self.editor.selectAll()
-
-        self.layout().replaceWidget(self.label, self.editor)
-        self.label.hide()
+        # Background (hover / selection) from the list stylesheet, then icon and title
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
 
-        # Install event filter
-        self.editor.installEventFilter(self)
+        rect = option.rect
+        pixmap = self.side_panel._CHAT_PIXMAP
+        painter.drawPixmap(rect.left() + self.ICON_X, rect.top() + (rect.height() - self.ICON_SIZE) // 2, pixmap)
 
-        # Enter pressed
-        self.editor.returnPressed.connect(self.finish_rename)
+        if self._editing is not None and self._editing == index:
+            return
+        title_rect = self._title_rect(rect)
+        painter.save()
+        painter.setPen(QColor("#333"))
+        painter.drawText(title_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                         option.fontMetrics.elidedText(data[1], Qt.ElideRight, title_rect.width()))
+        painter.restore()
 
-    def finish_rename(self):
+    # ---------------- Inline rename ----------------
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
+        # Styled by _RENAME_EDITOR_QSS on the side panel
+        editor.setObjectName("ChatRenameEditor")
+        self._editing = QPersistentModelIndex(index)
+        return editor
+
+    def destroyEditor(self, editor, index):
+        self._editing = None
+        super().destroyEditor(editor, index)
+
+    def setEditorData(self, editor, index):
+        editor.setText(index.data(Qt.UserRole)[1])
+        editor.selectAll()
+
+    def updateEditorGeometry(self, editor, option, index):
+        title_rect = self._title_rect(option.rect)
+        text_w = option.fontMetrics.horizontalAdvance(index.data(Qt.UserRole)[1])
+        width = min(max(text_w + 60, 120), max(title_rect.width(), 120))
+        height = option.fontMetrics.height() + 8
+        editor.setGeometry(title_rect.left(), title_rect.top() + (title_rect.height() - height) // 2, width, height)
+
+    def setModelData(self, editor, model, index):
         """
         Commit rename action:
-        - Update UI label
         - Update QListWidgetItem user role data
-        - Ask parent Side Panel to rename underlying .json on disk (if exists)
+        - Ask the side panel to rename the underlying .json on disk (if it exists)
         """
-        if not self.editor:
+        folder_name, old_title = index.data(Qt.UserRole)
+        new_title = editor.text().strip() or old_title
+        if new_title == old_title:
             return
-
-        old_title = self.label.text()
-        new_title = self.editor.text().strip() or old_title
-
-        # Update memory/UI first
-        self.parent_item.setData(Qt.UserRole, (self.folder_name, new_title))
-        self.label.setText(new_title)
-
-        # Notify Side Panel to rename the file on disk (if applicable).
-        # We rely on the QListWidget's parent being the Slide_Side_Panel instance.
-        try:
-            side_panel = self.history_list.parent()
-            # Check attribute presence for safety
-            if hasattr(side_panel, "rename_chat"):
-                # Use sanitized filename for disk rename, but keep UI label unchanged.
-                side_panel.rename_chat(self.parent_item, old_title, new_title)
-            else:
-                # If the method doesn't exist, just print a warning and continue.
-                print("[WARN] slide side panel has no rename_chat method — skipping disk rename.")
-        except Exception as e:
-            print(f"[WARN] rename_chat call failed: {e}")
-
-        self.editor.deleteLater()
-        self.editor = None
-        self.label.show()
-
-    # ---------------- Event Filter ----------------
-    def eventFilter(self, obj, event):
-        if obj == self.editor:
-            if event.type() == QEvent.FocusOut or \
-               (event.type() == QEvent.MouseButtonPress and not self.editor.rect().contains(event.pos())):
-                self.finish_rename()
-        return super().eventFilter(obj, event)
+        model.setData(index, (folder_name, new_title), Qt.UserRole)
+        item = self.side_panel.history_list.item(index.row())
+        self.side_panel.rename_chat(item, old_title, new_title)
 
 
 # ============================================================================
@@ -184,117 +180,185 @@ class ChatItemWidget(QWidget):
 # Simple folder header that can be expanded/collapsed and supports inline rename.
 # ============================================================================
 
+# Folder row styles, parsed once as part of the side panel stylesheet
+_FOLDER_QSS = """
+    QWidget[role="folderRow"] {
+        background-color: transparent;
+        border-radius: 6px;
+        font-weight: 500;
+    }
+    QWidget[role="folderRow"]:hover {
+        background-color: #e9ecef;
+    }
+    QWidget[role="folderRow"]:pressed {
+        background-color: #d0d0d0;
+    }
+"""
+
+_FOLDER_CLOSED_PATH = utils.resource_path("images/WIN11-Icons/icons8-folder-100.png")
+_FOLDER_OPEN_PATH = utils.resource_path("images/WIN11-Icons/icons8-opened-folder-100.png")
+_CHAT_ICON_PATH = utils.resource_path("images/WIN11-Icons/icons8-chat-100.png")
+
+# Every history row (folder or chat) uses this hint; the uniform-size fast path depends on it
+_ROW_SIZE_HINT = QSize(0, 36)
+
 class CollapsibleFolder(QWidget):
+    # GUI thread only: connect the bound signal with Qt.DirectConnection, slots call update()
     toggled = Signal(bool)
+    renamed = Signal(str, str)  # old name, new name
+
+    # 18x18 folder pixmaps shared by every folder, see _ensure_icons
+    _PM_OPEN = None
+    _PM_CLOSED = None
+
+    # Row metrics (formerly the QHBoxLayout margins/spacing)
+    MARGIN = 6
+    SPACING = 12
+    ICON_SIZE = 18
+    ROW_HEIGHT = 22
 
     def __init__(self, name: str, parent=None):
 
         super().__init__(parent)
 
-        self.setObjectName("CollapsibleFolder")
+        # Pixmaps are decoded by the first folder, never at import
+        if CollapsibleFolder._PM_OPEN is None:
+            self._ensure_icons()
+
+        self.setProperty("role", "folderRow")
+        # Let _FOLDER_QSS paint the row background directly. Not WA_OpaquePaintEvent:
+        # the row stays transparent so list selection shows through and the
+        # rounded hover corners do not cover every pixel
+        self.setAttribute(Qt.WA_StyledBackground, True)
 
         self.name = name
         self.is_expanded = True
         self.editor = None
-
-        # Layout
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(6, 2, 6, 2)
-        layout.setSpacing(12)
-
-        # Icon
-        self.icon_label = QLabel()
-        self.icon_label.setFixedSize(18, 18)
-        layout.addWidget(self.icon_label)
-
-        # Folder name label
-        self.name_label = QLabel(name)
-        self.name_label.setStyleSheet("font-weight:500; background:transparent;")
-        self.name_label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-        layout.addWidget(self.name_label)
-        layout.addStretch()
-
-        # Hover / Press style
-        self.setStyleSheet("""
-            #CollapsibleFolder {
-                background-color: transparent;
-                border-radius: 6px;
-            }
-            #CollapsibleFolder:hover {
-                background-color: #e9ecef;
-            }
-            #CollapsibleFolder:pressed {
-                background-color: #d0d0d0;
-            }
-        """)
-
-        self.update_icon()
+        self._editor_active = False
+        self._icon_state = self.is_expanded  # state the icon was last painted for
+        self._elided_name = None
+        self._name_width = None
+        # Set in resizeEvent
+        self._icon_rect = QRect()
+        self._name_rect = QRect()
+
+    # ---------------- Painting ----------------
+    # The row draws its icon and name itself instead of holding two QLabels;
+    # the background comes from _FOLDER_QSS through WA_StyledBackground
+    def sizeHint(self):
+        return QSize(0, self.ROW_HEIGHT)
+
+    def paintEvent(self, event):
+        region = event.region()
+        painter = QPainter(self)
+        icon_rect = self._icon_rect
+        if region.intersects(icon_rect):
+            painter.drawPixmap(icon_rect, self._PM_OPEN if self.is_expanded else self._PM_CLOSED)
+        name_rect = self._name_rect
+        if not self._editor_active and region.intersects(name_rect):
+            if self._elided_name is None:
+                self._elided_name = self.fontMetrics().elidedText(self.name, Qt.ElideRight, name_rect.width())
+            painter.drawText(name_rect, Qt.AlignVCenter | Qt.AlignLeft, self._elided_name)
+
+    # Long names are elided to the row width; recomputed lazily on the next paint
+    # Geometry is placed by hand: icon at the left margin, name in the rest of the row
+    def resizeEvent(self, event):
+        w, h = self.width(), self.height()
+        x = self.MARGIN + self.ICON_SIZE + self.SPACING
+        self._icon_rect = QRect(self.MARGIN, (h - self.ICON_SIZE) // 2, self.ICON_SIZE, self.ICON_SIZE)
+        self._name_rect = QRect(x, 0, max(0, w - x - self.MARGIN), h)
+        self._elided_name = None
+        if self._editor_active:
+            self.editor.move(x, (h - self.editor.height()) // 2)
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            self._elided_name = None
+            self._name_width = None
+        super().changeEvent(event)
 
     # ---------------- Toggle expand/collapse ----------------
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.is_expanded = not self.is_expanded
+            # update() only schedules a paint, no explicit repaint needed
             self.update_icon()
             self.toggled.emit(self.is_expanded)
+            # The row consumes the click; don't let the list re-handle the press
+            event.accept()
+            return
         super().mousePressEvent(event)
 
+    @classmethod
+    def _ensure_icons(cls):
+        """Decode the open/closed folder pixmaps shared by all folders."""
+        cls._PM_OPEN = QPixmap(_FOLDER_OPEN_PATH).scaled(
+            18, 18, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        cls._PM_CLOSED = QPixmap(_FOLDER_CLOSED_PATH).scaled(
+            18, 18, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
     def update_icon(self):
-        closed = utils.resource_path("images/WIN11-Icons/icons8-folder-100.png")
-        opened = utils.resource_path("images/WIN11-Icons/icons8-opened-folder-100.png")
-        icon_path = opened if self.is_expanded else closed
-        self.icon_label.setPixmap(QIcon(icon_path).pixmap(18, 18))
+        # Nothing to repaint if the icon already shows this state
+        if self._icon_state == self.is_expanded:
+            return
+        self._icon_state = self.is_expanded
+        self.update(self._icon_rect)
 
     # ---------------- Inline rename ----------------
     def start_rename(self):
-        if self.editor:
+        if self._editor_active:
             return
-        self.editor = QLineEdit(self.name_label.text(), self)
-        self.editor.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-        self.editor.setFixedHeight(20)
-        self.editor.setStyleSheet("""
-            QLineEdit {
-                background-color: #ffffff;
-                border: 1px solid #0078D4;
-                border-radius: 4px;
-                padding-left: 6px;
-                color: #333;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            QLineEdit:focus {
-                border: none;
-                outline: none;
-            }
-        """)
-        min_width = max(self.name_label.width() + 60, 180)
+        if self.editor is None:
+            # Built on the first rename and reused afterwards
+            self.editor = _RenameLineEdit(self)
+            self.editor.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
+            self.editor.setFixedHeight(20)
+            self.editor.setStyleSheet("""
+                QLineEdit {
+                    background-color: #ffffff;
+                    border: 1px solid #0078D4;
+                    border-radius: 4px;
+                    padding-left: 6px;
+                    color: #333;
+                    font-size: 14px;
+                    font-weight: 500;
+                }
+                QLineEdit:focus {
+                    border: none;
+                    outline: none;
+                }
+            """)
+            # Enter pressed or focus lost
+            self.editor.editingFinished.connect(self.finish_inline_edit)
+        self._editor_active = True
+        self.editor.setText(self.name)
+        # Text width from font metrics, measured once per name/font
+        if self._name_width is None:
+            self._name_width = self.fontMetrics().horizontalAdvance(self.name)
+        min_width = max(self._name_width + 60, 180)
         self.editor.setFixedWidth(min_width)
-        self.editor.move(self.name_label.pos())
+        self.editor.move(self._name_rect.x(), (self.height() - self.editor.height()) // 2)
         self.editor.show()
         self.editor.setFocus()
         self.editor.selectAll()
-        self.editor.installEventFilter(self)
-        self.editor.returnPressed.connect(self.finish_inline_edit)
-        self.name_label.hide()
+        self.update(self._name_rect)
 
     def finish_inline_edit(self):
-        if not self.editor:
+        if not self._editor_active:
             return
+        self._editor_active = False
+        old_name = self.name
         new_name = self.editor.text().strip()
-        if new_name:
-            self.name_label.setText(new_name)
+        # Unchanged or empty text just closes the editor
+        if new_name and new_name != old_name:
             self.name = new_name
-        self.editor.deleteLater()
-        self.editor = None
-        self.name_label.show()
-
-    def eventFilter(self, obj, event):
-        if obj == self.editor:
-            if event.type() == QEvent.FocusOut:
-                self.finish_inline_edit()
-            elif event.type() == QEvent.MouseButtonPress:
-                if not self.editor.rect().contains(event.pos()):
-                    self.finish_inline_edit()
-        return super().eventFilter(obj, event)
+            self._elided_name = None
+            self._name_width = None
+        self.editor.hide()
+        self.update(self._name_rect)
+        if self.name != old_name:
+            self.renamed.emit(old_name, self.name)
 
 
 # ============================================================================
@@ -314,10 +378,17 @@ class Slide_Side_Panel(QWidget):
     new_chat_requested = Signal()
     show_settings_requested = Signal()
 
+    # Decoded once per process and shared by every chat row / top button
+    _CHAT_PIXMAP = None
+    _BUTTON_PIXMAPS = {}
+
     def __init__(self, parent=None, storage_root: str = "ChatHistory"):
 
         super().__init__(parent)
 
+        if Slide_Side_Panel._CHAT_PIXMAP is None:
+            Slide_Side_Panel._CHAT_PIXMAP = QIcon(_CHAT_ICON_PATH).pixmap(16, 16)
+
         self.side_panel_width = 280
         self.is_visible = True
         self.drag_handle = getattr(parent, 'drag_handle', None)
@@ -328,6 +399,7 @@ class Slide_Side_Panel(QWidget):
         # Folder & Chat
         self.chats = {}
         self.folders = {}
+        self._widget_to_folder = {}  # id(folder widget) -> folder name
         self.chat_counter = 0
         self.folder_counter = 0
         self.active_folder = None  # <-- active folder name (string)
@@ -336,6 +408,13 @@ class Slide_Side_Panel(QWidget):
         self.storage_root = Path(storage_root)
         self.storage_root.mkdir(parents=True, exist_ok=True)
 
+        # SQLite title index so startup doesn't parse every chat file
+        try:
+            self.chat_store = ChatStore(utils.get_usr_dir() / "chat_index.db")
+        except Exception as e:
+            print(f"[WARN] Chat index unavailable, reading chat files directly: {e}")
+            self.chat_store = None
+
         self.setStyleSheet("""
             QWidget { background-color: #f8f9fa;}
             QPushButton { background: transparent; border: none; padding: 10px 16px; text-align: left; font-size: 14px; border-radius: 8px; }
@@ -385,7 +464,18 @@ class Slide_Side_Panel(QWidget):
             QScrollBar::handle:horizontal:hover {
                 background: rgba(0, 0, 0, 0.6);
             }
-        """)
+        """ + _RENAME_EDITOR_QSS + _FOLDER_QSS)
+
+        # Coalesces refresh_chat_list calls
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(100)
+        self._refresh_timer.timeout.connect(self._do_refresh_chat_list)
+
+        # Shift/rubber-band selections can fire itemClicked in bursts; run the
+        # handlers (and the chat_clicked / double-click emissions) at most every 50 ms
+        self.on_chat_item_clicked = qthrottled(self.on_chat_item_clicked, 50, parent=self)
+        self.on_chat_item_double_clicked = qthrottled(self.on_chat_item_double_clicked, 50, parent=self)
 
         # ---------------- UI Init ----------------
         self.init_ui()
@@ -420,7 +510,11 @@ class Slide_Side_Panel(QWidget):
             layout_btn.setSpacing(10)
 
             icon_label = QLabel()
-            icon_label.setPixmap(QIcon(utils.resource_path(icon_path)).pixmap(20,20))
+            pixmap = Slide_Side_Panel._BUTTON_PIXMAPS.get(icon_path)
+            if pixmap is None:
+                pixmap = QIcon(utils.resource_path(icon_path)).pixmap(20,20)
+                Slide_Side_Panel._BUTTON_PIXMAPS[icon_path] = pixmap
+            icon_label.setPixmap(pixmap)
             icon_label.setAlignment(Qt.AlignVCenter)
             icon_label.setStyleSheet("background: transparent;")
             layout_btn.addWidget(icon_label)
@@ -482,6 +576,16 @@ class Slide_Side_Panel(QWidget):
         self.history_list = QListWidget()
         self.history_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.history_list.setSelectionMode(QListWidget.ExtendedSelection)  # 支持 Shift / Ctrl 多选
+        # Folder and chat rows share one 36px size hint, so skip per-row measuring
+        self.history_list.setUniformItemSizes(True)
+        # Chat rows are painted by the delegate instead of one widget per row
+        self.history_list.setItemDelegate(ChatItemDelegate(self))
+        # Double click opens a chat; renaming starts only from the context menu
+        self.history_list.setEditTriggers(QListWidget.NoEditTriggers)
+        # Lay out long histories in batches so resizes don't walk every row at once
+        self.history_list.setLayoutMode(QListView.Batched)
+        self.history_list.setBatchSize(50)
+        self.history_list.setResizeMode(QListView.Adjust)
         self.history_list.customContextMenuRequested.connect(self.show_context_menu)
         self.history_list.itemClicked.connect(self.on_chat_item_clicked)
         self.history_list.itemDoubleClicked.connect(self.on_chat_item_double_clicked)
@@ -574,34 +678,50 @@ class Slide_Side_Panel(QWidget):
 
         folder_widget = CollapsibleFolder(name)
         item = QListWidgetItem()
-        item.setSizeHint(QSize(0,36))
+        item.setSizeHint(_ROW_SIZE_HINT)
         item.setFlags(item.flags() | Qt.ItemIsEditable)
         item.setData(Qt.UserRole, (name,""))
         self.history_list.addItem(item)
         self.history_list.setItemWidget(item, folder_widget)
 
-        self.folders[name] = {"widget":folder_widget,"item":item,"items":[],"expanded":True}
+        # "row" caches the header's list row so inserts don't need QListWidget.row()
+        self.folders[name] = {"widget":folder_widget,"item":item,"items":[],"expanded":True,
+                              "row":self.history_list.count()-1}
+        self._widget_to_folder[id(folder_widget)] = name
 
-        folder_widget.toggled.connect(lambda expanded, fw=folder_widget: self.on_folder_toggled(fw, expanded))
+        # Folder signals are main-thread only; connect directly so emits are plain calls
+        folder_widget.toggled.connect(lambda expanded, fw=folder_widget: self.on_folder_toggled(fw, expanded),
+                                      Qt.DirectConnection)
+        folder_widget.renamed.connect(lambda old, new, it=item: self.update_folder_name(it, old, new))
 
         # Set first created folder as active if none
         if not self.active_folder:
             self.active_folder = name
 
+    def _shift_folder_rows(self, after_row, delta):
+        """Move the cached rows of every folder below after_row by delta."""
+        for folder in self.folders.values():
+            if folder["row"] > after_row:
+                folder["row"] += delta
+
     def on_folder_toggled(self, folder_widget, expanded):
-        folder_name = None
-        for k,v in self.folders.items():
-            if v["widget"] is folder_widget:
-                folder_name = k
-                break
+        folder_name = self._widget_to_folder.get(id(folder_widget))
         if folder_name is None: return
         folder = self.folders[folder_name]
         folder["expanded"] = expanded
         for chat_item in folder["items"]:
             chat_item.setHidden(not expanded)
 
+        # The folder row keeps the click from the list, so make it active here
+        # (same as clicking a folder in on_chat_item_clicked)
+        self.active_folder = folder_name
+        self.history_list.clearSelection()
+
     # ---------------- Chat / Folder Click ----------------
     def on_chat_item_clicked(self,item):
+        # A throttled (trailing) call may arrive after the row was removed
+        if item.listWidget() is None:
+            return
         data = item.data(Qt.UserRole)
         if not data:
             return
@@ -617,7 +737,8 @@ class Slide_Side_Panel(QWidget):
 
 
     def on_chat_item_double_clicked(self, item):
-
+        if item.listWidget() is None:
+            return
         folder_name, chat_title = item.data(Qt.UserRole)
         if chat_title:  # 确保不是点击的文件夹
             self.chat_item_double_clicked.emit(folder_name, chat_title)
@@ -641,10 +762,11 @@ class Slide_Side_Panel(QWidget):
     # =========================================================================
     # Save / Add Chat UI + Disk (save_json flag controls whether to write file)
     # =========================================================================
-    def save_chat_to_folder(self, folder_name, title=None, save_json=True):
+    def save_chat_to_folder(self, folder_name, title=None, save_json=True, defer_stats=False):
         """
         Add a chat entry under folder_name in the side panel list.
         If save_json=True, also save a JSON file on disk.
+        If defer_stats=True, the caller updates the token stats itself (bulk loads).
         """
         folder = self.folders.get(folder_name)
         if not folder:
@@ -658,20 +780,14 @@ class Slide_Side_Panel(QWidget):
 
         # ---------------- Add to UI ----------------
         item = QListWidgetItem()
-        item.setSizeHint(QSize(0,36))
+        item.setSizeHint(_ROW_SIZE_HINT)
         item.setData(Qt.UserRole, (folder_name, chat_title))
-        chat_widget = ChatItemWidget(
-            chat_title=chat_title,
-            icon_path=utils.resource_path("images/WIN11-Icons/icons8-chat-100.png"),
-            parent_listwidget_item=item,
-            folder_name=folder_name,
-            history_list=self.history_list
-        )
-        row = self.history_list.row(folder["item"]) + len(folder["items"]) + 1
+        # Painted by ChatItemDelegate, no per-row widget; editable only through editItem
+        item.setFlags(item.flags() | Qt.ItemIsEditable)
+        row = folder["row"] + len(folder["items"]) + 1
         self.history_list.insertItem(row, item)
-        self.history_list.setItemWidget(item, chat_widget)
         folder["items"].append(item)
-        item.rename_chat_inline = chat_widget.start_rename
+        self._shift_folder_rows(folder["row"], 1)
 
         # ---------------- Save JSON to disk ----------------
         if save_json:
@@ -681,13 +797,11 @@ class Slide_Side_Panel(QWidget):
             safe_stem = sanitize_filename(chat_title)
             chat_file = folder_path / f"{safe_stem}.json"
             chat_data = {"title": chat_title, "messages": []}
-            try:
-                with open(chat_file, "w", encoding="utf-8") as f:
-                    json.dump(chat_data, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"Failed to save chat {chat_title}: {e}")
+            payload = json.dumps(chat_data, ensure_ascii=False, indent=2).encode("utf-8")
+            DiskWriter.submit(chat_file, payload)
 
-        self.update_tokens(self.chat_counter*100, self.chat_counter*0.002, 0.002)
+        if not defer_stats:
+            self.update_tokens(self.chat_counter*100, self.chat_counter*0.002, 0.002)
         return item
 
 
@@ -737,7 +851,7 @@ class Slide_Side_Panel(QWidget):
                 menu.addAction("Rename", lambda: self.rename_folder_inline(item))
                 menu.addAction("Delete", lambda: self.delete_folder(item))
             else:
-                menu.addAction("Rename", lambda: item.rename_chat_inline())
+                menu.addAction("Rename", lambda: self.history_list.editItem(item))
                 menu.addAction("Delete", lambda: self.delete_chat(item))
         else:
             # 多选删除
@@ -768,10 +882,8 @@ class Slide_Side_Panel(QWidget):
     def rename_folder_inline(self,item):
         folder_name,_ = item.data(Qt.UserRole)
         folder_widget = self.folders[folder_name]["widget"]
+        # The folder's renamed signal (connected in create_folder) syncs memory and disk
         folder_widget.start_rename()
-        if folder_widget.editor:
-            # when editingFinished fires, folder_widget.name has been updated in finish_inline_edit
-            folder_widget.editor.editingFinished.connect(lambda fw=folder_widget,it=item,old=folder_name: self.update_folder_name(it, old, fw.name))
 
     # ---------------- Stats ----------------
     def format_number(self, num):
@@ -792,14 +904,17 @@ class Slide_Side_Panel(QWidget):
     def refresh_chat_list(self):
         """
         Refresh the chat history UI.
+        Calls within 100 ms collapse into one pass, see _do_refresh_chat_list.
         """
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _do_refresh_chat_list(self):
         for folder_name, folder in self.folders.items():
 
             folder["widget"].update_icon()  # update folder icon
-            for chat_item in folder["items"]:
-                widget = self.history_list.itemWidget(chat_item)
-                if widget:
-                    widget.repaint()  # <-- 用 repaint() 而不是 update()
+        # Chat rows are delegate-painted, one scheduled viewport paint covers them all
+        self.history_list.viewport().update()
 
 
 
@@ -812,40 +927,86 @@ class Slide_Side_Panel(QWidget):
         Load all folders and chats from ChatHistory directory.
         Supports both old-style JSON (list of messages) and new-style (dict with title + messages).
         """
-        for folder_path in sorted(self.storage_root.iterdir()):
-            if not folder_path.is_dir():
-                continue
-            folder_name = folder_path.name
-            self.create_folder(folder_name)
-            folder = self.folders[folder_name]
+        # Suspend repaints of the whole panel (and list sorting, if ever enabled)
+        # while rows are inserted; token stats are updated once at the end
+        was_sorting = self.history_list.isSortingEnabled()
+        self.setUpdatesEnabled(False)
+        self.history_list.setSortingEnabled(False)
+        self.history_list.blockSignals(True)
+        try:
+            # os.scandir hands back DirEntry objects with cached type/stat info
+            with os.scandir(self.storage_root) as it:
+                folder_entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+
+            for folder_entry in folder_entries:
+                folder_path = Path(folder_entry.path)
+                folder_name = folder_entry.name
+                self.create_folder(folder_name)
+                folder = self.folders[folder_name]
+
+                # Files whose mtime matches the index are listed without being opened
+                folder_key = self._store_key(folder_name)
+                indexed = self.chat_store.folder_entries(folder_key) if self.chat_store else {}
+                changed = []
+                with os.scandir(folder_path) as it:
+                    chat_entries = sorted((e for e in it if e.name.endswith(".json") and e.is_file()),
+                                          key=lambda e: e.name)
+
+                for chat_entry in chat_entries:
+                    chat_file = Path(chat_entry.path)
+                    try:
+                        mtime_ns = chat_entry.stat().st_mtime_ns
+                        entry = indexed.get(chat_entry.name)
+                        if entry and entry[0] == mtime_ns:
+                            _, chat_title, message_count = entry
+                        else:
+                            # Parsed only for the title; messages are read when the chat is used
+                            with open(chat_file, "r", encoding="utf-8") as f:
+                                chat_data = json.load(f)
+
+                            # ---------------- Detect format ----------------
+                            if isinstance(chat_data, dict):
+                                chat_title = chat_data.get("title", chat_file.stem)
+                                message_count = len(chat_data.get("messages", []))
+                            elif isinstance(chat_data, list):
+                                # old format: list of messages
+                                chat_title = chat_file.stem
+                                message_count = len(chat_data)
+                            else:
+                                print(f"[WARN] Unknown chat file format: {chat_file}")
+                                continue
+                            changed.append((chat_entry.name, chat_title, message_count, mtime_ns))
+
+                        # ---------------- Add to side panel ----------------
+                        self.save_chat_to_folder(folder_name, title=chat_title, save_json=False,
+                                                 defer_stats=True)
+                        print(f"[INFO] Loaded chat: {chat_title} ({message_count} messages)")
+
+                    except Exception as e:
+                        print(f"[ERROR] Failed to load {chat_file}: {e}")
+
+                if self.chat_store:
+                    try:
+                        self.chat_store.sync_folder(folder_key, changed, [e.name for e in chat_entries])
+                    except Exception as e:
+                        print(f"[WARN] Failed to update chat index for {folder_name}: {e}")
+        finally:
+            self.history_list.blockSignals(False)
+            self.history_list.setSortingEnabled(was_sorting)
+            self.setUpdatesEnabled(True)
+            self.history_list.viewport().update()
+        self.update_tokens(self.chat_counter*100, self.chat_counter*0.002, 0.002)
 
-            for chat_file in sorted(folder_path.glob("*.json")):
-                try:
-                    with open(chat_file, "r", encoding="utf-8") as f:
-                        chat_data = json.load(f)
-
-                    # ---------------- Detect format ----------------
-                    if isinstance(chat_data, dict):
-                        chat_title = chat_data.get("title", chat_file.stem)
-                        messages = chat_data.get("messages", [])
-                    elif isinstance(chat_data, list):
-                        # old format: list of messages
-                        chat_title = chat_file.stem
-                        messages = chat_data
-                        # wrap into dict for compatibility
-                        chat_data = {"title": chat_title, "messages": messages}
-                    else:
-                        print(f"[WARN] Unknown chat file format: {chat_file}")
-                        continue
 
-                    # ---------------- Add to side panel ----------------
-                    item = self.save_chat_to_folder(folder_name, title=chat_title, save_json=False)
-                    # optionally attach loaded messages to the item for later display
-                    item.chat_messages = messages
-                    print(f"[INFO] Loaded chat: {chat_title} ({len(messages)} messages)")
+    def close_chat_store(self):
+        """Close the chat index on shutdown so SQLite checkpoints its WAL."""
+        if self.chat_store:
+            self.chat_store.close()
+            self.chat_store = None
 
-                except Exception as e:
-                    print(f"[ERROR] Failed to load {chat_file}: {e}")
+    def _store_key(self, folder_name):
+        """Index key of a chat folder: its absolute path, so storage roots don't collide."""
+        return str((self.storage_root / folder_name).resolve())
 
 
     # =========================================================================
@@ -867,6 +1028,7 @@ class Slide_Side_Panel(QWidget):
         """
         try:
             folder_name, _ = listwidget_item.data(Qt.UserRole)
+            DiskWriter.flush()
             folder_path = self.storage_root / folder_name
             if not folder_path.exists():
                 # No folder on disk — nothing to rename
@@ -955,6 +1117,7 @@ class Slide_Side_Panel(QWidget):
 
         # Rename folder in memory
         self.folders[new_name] = self.folders.pop(old_name)
+        self._widget_to_folder[id(self.folders[new_name]["widget"])] = new_name
         self.folders[new_name]["item"].setData(Qt.UserRole,(new_name,""))
         for chat_item in self.folders[new_name]["items"]:
             fn, title = chat_item.data(Qt.UserRole)
@@ -965,9 +1128,13 @@ class Slide_Side_Panel(QWidget):
         # Rename folder on disk
         old_path = self.storage_root / old_name
         new_path = self.storage_root / new_name
+        DiskWriter.flush()
         if old_path.exists():
             try:
+                old_key = self._store_key(old_name)
                 old_path.rename(new_path)
+                if self.chat_store:
+                    self.chat_store.rename_folder(old_key, self._store_key(new_name))
             except Exception as e:
                 print(f"Failed to rename folder {old_name} -> {new_name}: {e}")
 
@@ -977,19 +1144,23 @@ class Slide_Side_Panel(QWidget):
         if folder_name not in self.folders:
             return
         folder = self.folders.pop(folder_name)
+        self._widget_to_folder.pop(id(folder["widget"]), None)
 
-        # remove all chat items under the folder
-        for chat_item in folder["items"]:
-            self.history_list.takeItem(self.history_list.row(chat_item))
-        # remove folder header
-        self.history_list.takeItem(self.history_list.row(folder["item"]))
+        # remove all chat items under the folder, then the header (bottom-up keeps rows valid)
+        for row in range(folder["row"] + len(folder["items"]), folder["row"] - 1, -1):
+            self.history_list.takeItem(row)
+        self._shift_folder_rows(folder["row"], -(len(folder["items"]) + 1))
 
         # Delete folder on disk
+        DiskWriter.flush()
         folder_path = self.storage_root / folder_name
         if folder_path.exists():
             import shutil
             try:
+                folder_key = self._store_key(folder_name)
                 shutil.rmtree(folder_path)
+                if self.chat_store:
+                    self.chat_store.delete_folder(folder_key)
             except Exception as e:
                 print(f"Failed to delete folder {folder_name}: {e}")
 
@@ -1003,10 +1174,13 @@ class Slide_Side_Panel(QWidget):
         folder = self.folders.get(folder_name)
         if not folder or item not in folder["items"]:
             return
+        row = folder["row"] + 1 + folder["items"].index(item)
         folder["items"].remove(item)
-        self.history_list.takeItem(self.history_list.row(item))
+        self.history_list.takeItem(row)
+        self._shift_folder_rows(folder["row"], -1)
 
         # Delete JSON file on disk
+        DiskWriter.flush()
         chat_file = self.storage_root / folder_name / f"{chat_title}.json"
         # Try sanitized filename deletion as well (safer)
         chat_file_alt = self.storage_root / folder_name / f"{sanitize_filename(chat_title)}.json"
@@ -1028,26 +1202,40 @@ class Slide_Side_Panel(QWidget):
         if not lang_manager:
             return
 
+        t = lang_manager.get_texts([
+            "New chat", "Start a new chat", "New folder", "Create a new folder",
+            "Settings", "Open settings", "Chat History", "Tokens", "Total", "Today",
+        ])
+
+        # setText/setToolTip schedule a relayout even for identical strings, so skip those
+        def set_text(widget, text):
+            if widget.text() != text:
+                widget.setText(text)
+
+        def set_tip(widget, text):
+            if widget.toolTip() != text:
+                widget.setToolTip(text)
+
         # 1. 更新 "New Chat" 按钮
         # 注意：这里使用的是我们在 create_icon_button 里绑定的 inner_text_label
         if hasattr(self.btn_new_chat, "inner_text_label"):
-            self.btn_new_chat.inner_text_label.setText(lang_manager.get_text("New chat"))
-            self.btn_new_chat.setToolTip(lang_manager.get_text("Start a new chat"))
+            set_text(self.btn_new_chat.inner_text_label, t["New chat"])
+            set_tip(self.btn_new_chat, t["Start a new chat"])
 
         # 2. 更新 "New Folder" 按钮
         if hasattr(self.btn_new_folder, "inner_text_label"):
-            self.btn_new_folder.inner_text_label.setText(lang_manager.get_text("New folder"))
-            self.btn_new_folder.setToolTip(lang_manager.get_text("Create a new folder"))
+            set_text(self.btn_new_folder.inner_text_label, t["New folder"])
+            set_tip(self.btn_new_folder, t["Create a new folder"])
 
         # 3. 更新 "Settings" 按钮
         if hasattr(self.btn_settings, "inner_text_label"):
-            self.btn_settings.inner_text_label.setText(lang_manager.get_text("Settings"))
-            self.btn_settings.setToolTip(lang_manager.get_text("Open settings"))
+            set_text(self.btn_settings.inner_text_label, t["Settings"])
+            set_tip(self.btn_settings, t["Open settings"])
             
         # 4. 如果你还有其他的 label (比如 "Chat History" 的标题)，也在这里更新
-        self.history_label.setText(lang_manager.get_text("Chat History"))
+        set_text(self.history_label, t["Chat History"])
 
         # 5. Token stats labels
-        self.current_tokens_title.setText(f"{lang_manager.get_text('Tokens')}:")
-        self.total_tokens_title.setText(f"{lang_manager.get_text('Total')}:")
-        self.today_tokens_title.setText(f"{lang_manager.get_text('Today')}:")
+        set_text(self.current_tokens_title, f"{t['Tokens']}:")
+        set_text(self.total_tokens_title, f"{t['Total']}:")
+        set_text(self.today_tokens_title, f"{t['Today']}:")
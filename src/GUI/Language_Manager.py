@@ -82,6 +82,15 @@ class Language_Manager:
         print(f"Language: {self.language}, Key: {key}")
         return self.translations.get(self.language, {}).get(key, key)
 
+    #-------------------------------------------------------------------------------------
+    def get_texts(self, keys):
+        """
+        Get translated texts for several keys at once, as a {key: text} dict.
+        Missing keys fall back to the key itself, same as get_text.
+        """
+        table = self.translations.get(self.language, {})
+        return {key: table.get(key, key) for key in keys}
+
     #-------------------------------------------------------------------------------------
     def get_current_language(self):
         return self.language
@@ -20,14 +20,18 @@ from PySide6.QtWidgets import (
     QFormLayout, QGridLayout,
     QMessageBox
 )
-from PySide6.QtGui import QPixmap, QFont, QIcon
+from PySide6.QtGui import QPixmap, QPixmapCache, QFont, QIcon
 from PySide6.QtCore import Qt, QSize, QSettings
 
 from GUI.GUI_Chat_Combo import AI_Chat_App
+from Utils.Utils import DiskWriter
 
 if __name__ == '__main__':
     
     app = QApplication(sys.argv)
+    QPixmapCache.setCacheLimit(64 * 1024)   # KB, room for a few full-size chat backgrounds
+    app.aboutToQuit.connect(DiskWriter.flush)   # finish queued chat writes before exit
     window = AI_Chat_App()
+    app.aboutToQuit.connect(window.side_panel.close_chat_store)
     window.show()
     sys.exit(app.exec())
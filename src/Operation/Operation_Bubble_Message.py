@@ -6,6 +6,7 @@
 #----------------------------------------------------------------------------------------- 
 
 import sys
+import functools
 import re
 import io
 import base64
@@ -35,6 +36,7 @@ md_converter = markdown.Markdown(extensions=[
     'codehilite': {'css_class': 'codehilite', 'noclasses': False, 'use_pygments': True}
 })
 
+@functools.lru_cache(maxsize=1)
 def get_copy_icon():
     return QIcon(utils.resource_path("images/WIN11-Icons/icons8-copy-100.png"))
 
@@ -17,6 +17,7 @@ import matplotlib.pyplot as plt
 import latex2mathml.converter
 import markdown
 import mimetypes
+import logging
 
 from datetime import datetime
 from pathlib import Path
@@ -25,7 +26,9 @@ from PySide6.QtCore import QTimer, QThread, Signal, Qt
 from PySide6.QtGui import QImageReader 
 
 from Operation.Operation_Bubble_Message import BubbleMessage, HTML_WRAPPER
-from Utils.Utils import utils
+from Utils.Utils import DiskWriter, utils
+
+logger = logging.getLogger(__name__)
 
 # ============================================================
 # Backend rendering configuration and markdown converter setup
@@ -316,6 +319,12 @@ class AIChatWorker(QThread):
 
 class Operation_Chat_Controller:
 
+    # Opening a chat only builds the newest bubbles, older ones are built
+    # in batches when the user scrolls up to the top
+    INITIAL_BUBBLES   = 30
+    BUBBLE_BATCH      = 20
+    LOAD_MORE_PX      = 40
+
     def __init__(self, main_window, model="openai/gpt-4o"):
 
         # References to main window components
@@ -323,7 +332,7 @@ class Operation_Chat_Controller:
         self.scroll_area     = main_window.chat_window.scroll_area
         self.result_display  = main_window.chat_window.result_layout
         self.side_panel      = main_window.side_panel
-        self.setting_window  = main_window.setting_page
+        self.settings        = main_window.settings
 
 
         # Get the initial model from the tool bar
@@ -332,13 +341,22 @@ class Operation_Chat_Controller:
 
 
         # Get the API Key and base URL from settings
-        self.api_key  = self.setting_window.get_api_key()
-        self.base_url = self.setting_window.get_base_url()  
+        self.api_key  = self.settings.value("AI/api_key", "", type=str)
+        self.base_url = self.settings.value("AI/base_url", "", type=str)
 
 
         self.current_chat_file = None
         self.active_chat_path = None
         self.chat_history = []
+        # Chat files this process queued or opened, known to exist without asking the disk
+        self._known_chat_files = set()
+
+        # Messages of the open chat that have no bubble yet (oldest first)
+        self._pending_bubbles = []
+        # Bumped whenever another chat is shown, so queued callbacks can tell they are stale
+        self._chat_generation = 0
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._on_scroll_value_changed)
+        self.scroll_area.verticalScrollBar().rangeChanged.connect(self._on_scroll_range_changed)
         
         # 1. Initialize Token Manager
         self.token_manager = TokenManager() 
@@ -387,11 +405,11 @@ class Operation_Chat_Controller:
         # Also update worker's model
         # Get the new API Key and base URL from settings
         # If the worker exists, update its config
-        new_key = self.setting_window.get_api_key()
-        new_url = self.setting_window.get_base_url()
+        new_key = self.settings.value("AI/api_key", "", type=str)
+        new_url = self.settings.value("AI/base_url", "", type=str)
 
         print(f"[INFO] Updating AIChatWorker with model: {self.model}, new_url: {new_url}")
-        print(f"[INFO] Updating API Key: {new_key}")
+        logger.debug("Updating API Key: %s...", new_key[:6])
 
         if self.worker:
             self.worker.update_config(new_key, new_url, new_model)
@@ -460,9 +478,10 @@ class Operation_Chat_Controller:
         If current_chat_file already exists on disk, keep it.
         Otherwise create a new file under active folder.
         """
-        # 1. If file exists, return
-        if self.current_chat_file and Path(self.current_chat_file).exists():
-            return
+        # 1. If file exists (or its create is already queued), return
+        if self.current_chat_file:
+            if self.current_chat_file in self._known_chat_files or Path(self.current_chat_file).exists():
+                return
 
         # 2. Create new file logic
         folder = self.side_panel.active_folder or "Default folder"
@@ -478,11 +497,12 @@ class Operation_Chat_Controller:
             "messages": []
         }
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(init_data, f, ensure_ascii=False, indent=2)
+        payload = json.dumps(init_data, ensure_ascii=False, indent=2).encode("utf-8")
+        DiskWriter.submit(file_path, payload)
 
         self.current_chat_file = str(file_path)
-        self.side_panel.save_chat_to_folder(folder, title=init_data["title"])
+        self._known_chat_files.add(self.current_chat_file)
+        self.side_panel.save_chat_to_folder(folder, title=init_data["title"], save_json=False)
 
 
     # ---------------------------------------------------------
@@ -577,13 +597,9 @@ class Operation_Chat_Controller:
                 
             self.chat_history.append(msg_data)
             
-            try:
-                Path(self.current_chat_file).write_text(
-                    json.dumps(self.chat_history, ensure_ascii=False, indent=2),
-                    encoding="utf-8"
-                )
-            except Exception as e:
-                print(f"[ERR] Failed to write chat history: {e}")
+            # Queued behind the file's create, so the writer thread keeps them in order
+            payload = json.dumps(self.chat_history, ensure_ascii=False, indent=2).encode("utf-8")
+            DiskWriter.submit(self.current_chat_file, payload)
 
     # ... helper for images (unchanged) ...
     def _get_image_data_uri(self, image_source):
@@ -612,7 +628,7 @@ class Operation_Chat_Controller:
 
     def _history_to_messages(self):
 
-        user_persona = self.setting_window.get_system_prompt()
+        user_persona = self.settings.value("AI/system_prompt", "You are a helpful assistant.", type=str)
 
 
         latex_instruction = (
@@ -687,7 +703,57 @@ class Operation_Chat_Controller:
         except Exception:
             pass
 
+    def _make_history_bubble(self, msg, w):
+        role = msg["role"]
+        return BubbleMessage(
+            text=msg["text"],
+            images=msg["images"],
+            is_user=(role=="user"),
+            parent_width=w,
+            model_name=msg["model"] if role=="assistant" else "User", 
+            ai_logo=self.model_logo if role=="assistant" else None
+        )
+
+    def _on_scroll_value_changed(self, value):
+        if self._pending_bubbles and value <= self.LOAD_MORE_PX:
+            self._load_older_bubbles()
+
+    def _on_scroll_range_changed(self, _min, _max):
+        self._fill_viewport()
+
+    def _fill_viewport(self):
+        # Without a scroll range valueChanged never fires, keep loading until the view can scroll
+        if self._pending_bubbles and self.scroll_area.verticalScrollBar().maximum() == 0:
+            self._load_older_bubbles()
+
+    def _load_older_bubbles(self):
+        """
+        Build the next batch of older bubbles on top of the list and keep
+        the currently visible messages in place.
+        """
+        batch = self._pending_bubbles[-self.BUBBLE_BATCH:]
+        del self._pending_bubbles[-self.BUBBLE_BATCH:]
+
+        bar = self.scroll_area.verticalScrollBar()
+        old_max = bar.maximum()
+        old_value = bar.value()
+
+        w = max(100, self.scroll_area.viewport().width() - 40)
+        for i, msg in enumerate(batch):
+            self.result_display.insertWidget(i, self._make_history_bubble(msg, w))
+
+        generation = self._chat_generation
+
+        def restore_position():
+            if generation != self._chat_generation:
+                return
+            bar.setValue(old_value + bar.maximum() - old_max)
+            self._fill_viewport()
+        QTimer.singleShot(0, restore_position)
+
     def handle_new_chat(self):
+        self._pending_bubbles = []
+        self._chat_generation += 1
         self.chat_window.clear_all_messages()
         self.current_chat_file = None 
 
@@ -701,13 +767,11 @@ class Operation_Chat_Controller:
         chat_file = folder_path / f"{chat_title}.json"
         chat_data = {"title": chat_title, "folder": folder_name, "messages": []}
 
-        try:
-            with open(chat_file, "w", encoding="utf-8") as f:
-                json.dump(chat_data, f, ensure_ascii=False, indent=2)
-            self.current_chat_file = str(chat_file) 
-            print(f"[INFO] New chat file created at: {chat_file}")
-        except Exception as e:
-            print(f"Failed to create new chat file: {e}")
+        payload = json.dumps(chat_data, ensure_ascii=False, indent=2).encode("utf-8")
+        DiskWriter.submit(chat_file, payload)
+        self.current_chat_file = str(chat_file) 
+        self._known_chat_files.add(self.current_chat_file)
+        print(f"[INFO] New chat file queued at: {chat_file}")
 
         self.side_panel.save_chat_to_folder(folder_name, title=chat_title, save_json=False)
         self.side_panel.refresh_chat_list()
@@ -717,6 +781,9 @@ class Operation_Chat_Controller:
         Open a chat file and render its messages into the chat window.
         Enhanced: uses resolve_chat_file to handle mismatches between UI title and actual filename.
         """
+        # Queued writes must land before the file is looked up and read back
+        DiskWriter.flush()
+
         # Try to resolve the file robustly
         chat_file = self.resolve_chat_file(folder, chat_title)
 
@@ -725,7 +792,10 @@ class Operation_Chat_Controller:
             return
 
         self.current_chat_file = str(chat_file)
+        self._known_chat_files.add(self.current_chat_file)
         self.chat_history = [] 
+        self._pending_bubbles = []
+        self._chat_generation += 1
         self.chat_window.clear_all_messages()
 
         try:
@@ -753,17 +823,14 @@ class Operation_Chat_Controller:
 
             self.chat_history.append({"role": role, "text": text, "images": images, "model": saved_model_name})
 
-            bubble = BubbleMessage(
-                text=text,
-                images=images,
-                is_user=(role=="user"),
-                parent_width=w,
-                model_name=saved_model_name if role=="assistant" else "User", 
-                ai_logo=self.model_logo if role=="assistant" else None
-            )
+        split = max(0, len(self.chat_history) - self.INITIAL_BUBBLES)
+        self._pending_bubbles = self.chat_history[:split]
+        for msg in self.chat_history[split:]:
+            bubble = self._make_history_bubble(msg, w)
             self.result_display.insertWidget(self.result_display.count()-2, bubble)
 
         QTimer.singleShot(0, self._scroll_to_bottom)
+        QTimer.singleShot(0, self._fill_viewport)
 
         print(f"[INFO] Loaded chat '{chat_title}' from folder '{folder}'")
 
@@ -42,19 +42,27 @@ class Operation_Setting_Controller(QObject):
 
     def __init__(self, parent = None):
         self.main_window  = parent
-        self.setting_page = parent.setting_page
         self.tool_bar     = parent.tool_bar
         self.side_panel   = parent.side_panel
         self.chat_window  = parent.chat_window
 
         self.operation_mainwindow  = Operation_Mainwindow_Controller(self.main_window) 
         
-        usr_folder = utils.get_usr_dir()
-        self.settings_file_path = usr_folder / "settings.ini"
+        self.settings_file_path = utils.get_settings_path()
 
     #-----------------------------------------------------------------------
-    def apply_new_settings(self):
-        settings = QSettings(str(self.settings_file_path), QSettings.Format.IniFormat)
+    @property
+    def setting_page(self):
+        # None until the user opens the preferences dialog for the first time
+        return self.main_window._setting_page
+
+    #-----------------------------------------------------------------------
+    def apply_new_settings(self, settings=None):
+        # Reuse the main window's QSettings instead of parsing settings.ini again
+        if settings is None:
+            settings = getattr(self.main_window, "settings", None)
+        if settings is None:
+            settings = QSettings(str(self.settings_file_path), QSettings.Format.IniFormat)
 
         font_type = settings.value("Font/type", "Times New Roman")
         font_size = int(settings.value("Font/size", "10"))
@@ -180,19 +188,13 @@ class Operation_Setting_Controller(QObject):
                 ai_ctrls["system_prompt"].setPlainText(saved_prompt)
 
             if "provider" in ai_ctrls:
-                saved_provider = settings.value("AI/provider", "openrouter").lower().strip()
+                saved_provider = settings.value("AI/provider", "openrouter")
                 provider_combo = ai_ctrls["provider"]
-                matched_index = -1
-                for i in range(provider_combo.count()):
-                    item = provider_combo.itemText(i).lower()
-                    if saved_provider in item:
-                        matched_index = i
-                        break
+                matched_index = self.setting_page.find_provider_index(saved_provider)
                 if matched_index != -1:
                     provider_combo.setCurrentIndex(matched_index)
                 else:
-                    custom_index = provider_combo.findText("Custom")
-                    provider_combo.setCurrentIndex(custom_index)
+                    provider_combo.setCurrentIndex(self.setting_page.PROVIDER_INDEX["custom"])
 
             if "api_key" in ai_ctrls:
                 saved_key = settings.value("AI/api_key", "")
@@ -8,8 +8,14 @@
 
 import sys
 import re
+import queue
+import sqlite3
+import threading
+import functools
 from pathlib import Path
 
+from PySide6.QtCore import QSettings, QTimer
+
 class utils:
 
     #--------------------------------------------------------------
@@ -33,6 +39,7 @@ class utils:
     #--------------------------------------------------------------
     # For dynamic file, such as input/output result file
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_usr_dir():
         if getattr(sys, 'frozen', False):
             # PyInstaller mode
@@ -46,6 +53,16 @@ class utils:
         return usr_dir
     #--------------------------------------------------------------
 
+    #--------------------------------------------------------------
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_settings_path():
+        """
+        Return the path of usr/settings.ini (resolved once and cached).
+        """
+        return utils.get_usr_dir() / "settings.ini"
+    #--------------------------------------------------------------
+
     #--------------------------------------------------------------
     @staticmethod
     def convert_sub_and_superscript(text):
@@ -108,3 +125,182 @@ class utils:
         return folder_path / f"{safe_title}.json"
 
     #--------------------------------------------------------------
+
+
+
+#-----------------------------------------------------------------------------------------
+class CachedSettings(QSettings):
+    """
+    QSettings that keeps the values it has already read in a local dict,
+    so repeated reads of the same key skip the variant conversion.
+
+    Writes through this object update the cache automatically. Call
+    clear_cache() after another QSettings instance has changed the file.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = {}
+
+    def value(self, key, defaultValue=None, type=None):
+        cache_key = (key, type)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        if type is None:
+            result = super().value(key, defaultValue)
+        else:
+            result = super().value(key, defaultValue, type=type)
+
+        # Only remember values that exist, defaults may differ per caller
+        if self.contains(key):
+            self._cache[cache_key] = result
+        return result
+
+    def setValue(self, key, value):
+        super().setValue(key, value)
+        for cache_key in [k for k in self._cache if k[0] == key]:
+            del self._cache[cache_key]
+
+    def remove(self, key):
+        super().remove(key)
+        self._cache.clear()
+
+    def clear_cache(self):
+        self._cache.clear()
+#-----------------------------------------------------------------------------------------
+
+
+#-----------------------------------------------------------------------------------------
+class ChatStore:
+    """
+    SQLite index over the ChatHistory tree: one row per chat JSON with its
+    title, message count and mtime. The JSON files stay the source of truth;
+    the index lets startup list every chat with one query per folder instead
+    of opening and parsing each file.
+    """
+
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=10000")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chats (
+                folder     TEXT NOT NULL,
+                file       TEXT NOT NULL,
+                title      TEXT NOT NULL,
+                messages   INTEGER NOT NULL DEFAULT 0,
+                mtime_ns   INTEGER NOT NULL,
+                PRIMARY KEY (folder, file)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chats_folder ON chats(folder)")
+        self.conn.commit()
+
+    def folder_entries(self, folder):
+        """Return {file name: (mtime_ns, title, message count)} for one folder."""
+        rows = self.conn.execute(
+            "SELECT file, mtime_ns, title, messages FROM chats WHERE folder = ?", (folder,))
+        return {file: (mtime_ns, title, messages) for file, mtime_ns, title, messages in rows}
+
+    def sync_folder(self, folder, upserts, keep_files):
+        """Write changed rows and drop rows whose file is gone, in one transaction."""
+        with self.conn:
+            if upserts:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO chats (folder, file, title, messages, mtime_ns) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(folder, file, title, messages, mtime_ns)
+                     for file, title, messages, mtime_ns in upserts])
+            stale = set(self.folder_entries(folder)) - set(keep_files)
+            if stale:
+                self.conn.executemany(
+                    "DELETE FROM chats WHERE folder = ? AND file = ?",
+                    [(folder, file) for file in stale])
+
+    def rename_folder(self, old_folder, new_folder):
+        with self.conn:
+            self.conn.execute("UPDATE chats SET folder = ? WHERE folder = ?", (new_folder, old_folder))
+
+    def delete_folder(self, folder):
+        with self.conn:
+            self.conn.execute("DELETE FROM chats WHERE folder = ?", (folder,))
+
+    def close(self):
+        self.conn.close()
+#-----------------------------------------------------------------------------------------
+
+
+#-----------------------------------------------------------------------------------------
+def qthrottled(func, timeout, leading=True, parent=None):
+    """
+    Wrap func so it runs at most once per `timeout` ms (QTimer based, GUI thread only).
+
+    With leading=True the first call runs immediately; calls arriving inside
+    the window are coalesced and the last one runs when the window closes.
+    The timer is parented to `parent` so it lives as long as the owner widget.
+    """
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(timeout)
+    pending = []
+
+    def on_timeout():
+        if pending:
+            args, kwargs = pending.pop()
+            timer.start()
+            func(*args, **kwargs)
+
+    timer.timeout.connect(on_timeout)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if leading and not timer.isActive():
+            timer.start()
+            func(*args, **kwargs)
+            return
+        pending[:] = [(args, kwargs)]
+        if not timer.isActive():
+            timer.start()
+
+    return wrapper
+#-----------------------------------------------------------------------------------------
+
+
+#-----------------------------------------------------------------------------------------
+class DiskWriter:
+    """
+    Background writer for chat JSON files (side panel and chat controller),
+    so disk I/O never blocks the UI thread.
+    Jobs are (path, bytes) pairs written in submission order by one daemon thread.
+    Call flush() before touching those files on disk again and on app shutdown.
+    """
+    _queue = queue.Queue()
+    _thread = None
+
+    @classmethod
+    def submit(cls, path, data: bytes):
+        if cls._thread is None:
+            cls._thread = threading.Thread(target=cls._run, name="DiskWriter", daemon=True)
+            cls._thread.start()
+        cls._queue.put((Path(path), data))
+
+    @classmethod
+    def flush(cls):
+        """Block until every submitted job has been written."""
+        if cls._thread is not None:
+            cls._queue.join()
+
+    @classmethod
+    def _run(cls):
+        while True:
+            path, data = cls._queue.get()
+            try:
+                path.write_bytes(data)
+            except Exception as e:
+                print(f"[ERROR] Failed to write {path}: {e}")
+            finally:
+                cls._queue.task_done()
+#-----------------------------------------------------------------------------------------